@@ -0,0 +1,237 @@
+# CoachModule.py
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+SYSTEM_PROMPT = """
+You are a professional AI Personal Trainer Pro.
+Your goal is to provide technical, motivational, and safe advice about gym exercises.
+
+CURRENT USER DATA:
+{context}
+
+Rules:
+1. If asked about form, be detailed (Pushups, Pullups, Squats).
+2. If the user mentions their history or "how did I do?", use the context provided above.
+3. Be motivational but focus on safety. Use terms like "Range of Motion", "Tempo", and "Lockout".
+4. If the user had "Pull higher" issues, explain that they aren't getting their chin above the bar.
+5. If they had "Extend fully" issues, explain they aren't dropping low enough to the dead-hang position.
+6. Keep responses futuristic, helpful, and concise (under 100 words).
+"""
+
+
+def normalize_question(question):
+    # "How do I squat deeper?? " and "how do i squat deeper" share a cache entry
+    return re.sub(r"\s+", " ", question.strip().lower()).rstrip("?!. ")
+
+
+def gemini_model(api_key, name="gemini-flash-latest"):
+    # Imported here: google.generativeai takes most of a second to import
+    import google.generativeai as genai
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(name)
+
+
+class AICoach:
+    """
+    Answers chat questions with the workout history as context.
+
+    model: anything with generate_content(prompt) returning an object with .text,
+           and generate_content(prompt, stream=True) yielding such chunks
+           (a Gemini GenerativeModel, or StubModel offline / in tests)
+    summary_fn: builds the history text; its result is cached until
+                invalidate_context() is called after a session is saved
+
+    Answers are cached in memory (LRU) and on disk, keyed by the normalized
+    question plus a hash of the context, so a repeated question is only sent
+    to the model again once the history has changed. Empty answers (e.g. a
+    blocked reply) are never cached. The least recently used files are evicted
+    once the disk tier exceeds max_disk_bytes.
+    """
+
+    def __init__(self, model, summary_fn, cache_size=128, cache_dir=".coach_cache", max_disk_bytes=4 * 1024 * 1024):
+        self.model = model
+        self.summary_fn = summary_fn
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.lock = threading.Lock()
+        self.responses = OrderedDict()
+        self._context = None
+
+    # ==============================
+    # CONTEXT
+    # ==============================
+    def context(self):
+        """(summary text, hash) for the current history, built at most once per save."""
+        with self.lock:
+            if self._context is not None:
+                return self._context
+        text = self.summary_fn()
+        entry = (text, hashlib.sha256(text.encode()).hexdigest()[:16])
+        with self.lock:
+            self._context = entry
+        return entry
+
+    def invalidate_context(self):
+        with self.lock:
+            self._context = None
+
+    def build_prompt(self, question, context_text):
+        return f"{SYSTEM_PROMPT.format(context=context_text)}\n\nUser Question: {question}"
+
+    # ==============================
+    # ANSWERS
+    # ==============================
+    def cache_key(self, question, context_hash):
+        return hashlib.sha256(f"{context_hash}|{normalize_question(question)}".encode()).hexdigest()
+
+    def ask(self, question):
+        context_text, context_hash = self.context()
+        key = self.cache_key(question, context_hash)
+        cached = self.cached(key)
+        if cached is not None:
+            return cached
+
+        response = self.model.generate_content(self.build_prompt(question, context_text)).text
+        if response:
+            self.store(key, question, response)
+        return response
+
+    def ask_stream(self, question, on_text, cancel=None):
+        """
+        Streams the answer: on_text(text_so_far) is called as chunks arrive.
+        Stops early once cancel (a threading.Event) is set. Returns the full
+        text, or None when cancelled. Only complete, non-empty answers are cached.
+        """
+        context_text, context_hash = self.context()
+        key = self.cache_key(question, context_hash)
+        cached = self.cached(key)
+        if cached is not None:
+            on_text(cached)
+            return cached
+
+        start = time.perf_counter()
+        first_token = None
+        parts = []
+        stream = self.model.generate_content(self.build_prompt(question, context_text), stream=True)
+        for chunk in stream:
+            if cancel is not None and cancel.is_set():
+                print(f"Coach: cancelled after {(time.perf_counter() - start) * 1000:.0f} ms")
+                return None
+            try:
+                text = chunk.text
+            except ValueError:
+                continue # Chunk without text parts (e.g. safety metadata)
+            if not text:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            parts.append(text)
+            on_text("".join(parts))
+
+        total = time.perf_counter() - start
+        response = "".join(parts)
+        ttft = f"{first_token * 1000:.0f} ms" if first_token is not None else "n/a"
+        print(f"Coach: first token {ttft}, total {total * 1000:.0f} ms, {len(parts)} chunks")
+        if response:
+            self.store(key, question, response)
+        return response
+
+    def cached(self, key):
+        with self.lock:
+            response = self.responses.get(key)
+            if response is not None:
+                self.responses.move_to_end(key)
+                return response
+
+        # Disk tier: answers from earlier runs
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding="utf-8") as f:
+                response = json.load(f)["response"]
+            os.utime(path) # Mark as recently used for eviction
+        except (OSError, ValueError, KeyError):
+            return None
+        if not response:
+            return None
+        self._remember(key, response)
+        return response
+
+    def store(self, key, question, response):
+        self._remember(key, response)
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(key)}.tmp"
+            with open(tmp_path, 'w', encoding="utf-8") as f:
+                json.dump({"question": question, "response": response}, f)
+            os.replace(tmp_path, self._path(key))
+            self.evict()
+        except OSError as e:
+            print(f"Could not cache coach response: {e}")
+
+    def evict(self):
+        entries = []
+        for f in os.listdir(self.cache_dir):
+            if not f.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, f))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, f))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, f in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, f))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _remember(self, key, response):
+        with self.lock:
+            self.responses[key] = response
+            self.responses.move_to_end(key)
+            if len(self.responses) > self.cache_size:
+                self.responses.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+
+class StubModel:
+    """
+    Offline stand-in for GenerativeModel: answers every prompt with canned text.
+    With stream=True the reply comes word by word, chunk_delay seconds apart.
+    """
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    def __init__(self, reply="Keep your core tight and control the tempo.", chunk_delay=0.0):
+        self.reply = reply
+        self.chunk_delay = chunk_delay
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        if not stream:
+            return self.Response(self.reply)
+        return self._stream()
+
+    def _stream(self):
+        for word in re.findall(r"\S+\s*", self.reply):
+            time.sleep(self.chunk_delay)
+            yield self.Response(word)
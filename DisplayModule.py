@@ -0,0 +1,75 @@
+# DisplayModule.py
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+DISPLAY_HEIGHT = 600
+
+
+def display_size(frame_w, frame_h, target_height=DISPLAY_HEIGHT):
+    # Keep the aspect ratio at the target height
+    return int(target_height * frame_w / frame_h), target_height
+
+
+def downscale(frame, target_height=DISPLAY_HEIGHT):
+    """
+    Frame resized to display size plus the factor from frame to display pixels,
+    so overlays can be drawn on the small copy from full-resolution landmarks.
+    """
+    h, w = frame.shape[:2]
+    size = display_size(w, h, target_height)
+    if size == (w, h):
+        return frame, 1.0
+    return cv2.resize(frame, size), target_height / h
+
+
+class FrameDisplay:
+    """
+    Shows BGR frames on a Tk label without per-frame allocations. Resize and
+    colour conversion write into reused buffers, the PIL image shares memory
+    with the RGBA buffer, and one PhotoImage is updated in place with paste().
+    Buffers and the PhotoImage are only rebuilt when the frame size changes.
+    """
+
+    def __init__(self, label=None, target_height=DISPLAY_HEIGHT):
+        self.label = label
+        self.target_height = target_height
+        self.frame_size = None
+        self.size = None
+        self.resized = None
+        self.rgba = None
+        self.image = None
+        self.photo = None
+
+    def allocate(self, frame_w, frame_h):
+        self.frame_size = (frame_w, frame_h)
+        self.size = display_size(frame_w, frame_h, self.target_height)
+        w, h = self.size
+        self.resized = np.empty((h, w, 3), dtype=np.uint8)
+        self.rgba = np.empty((h, w, 4), dtype=np.uint8)
+        # RGBA is one of the modes PIL can wrap without copying
+        self.image = Image.frombuffer("RGBA", self.size, self.rgba, "raw", "RGBA", 0, 1)
+        self.photo = None
+
+    def prepare(self, frame):
+        """Converts frame into the shared display buffer and returns the PIL image over it."""
+        h, w = frame.shape[:2]
+        if (w, h) != self.frame_size:
+            self.allocate(w, h)
+
+        if (w, h) == self.size:
+            # Frame is already at display size (e.g. drawn at display resolution)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+        else:
+            cv2.resize(frame, self.size, dst=self.resized)
+            cv2.cvtColor(self.resized, cv2.COLOR_BGR2RGBA, dst=self.rgba)
+        return self.image
+
+    def show(self, frame):
+        image = self.prepare(frame)
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(image=image)
+            self.label.configure(image=self.photo)
+            self.label.image = self.photo
+        else:
+            self.photo.paste(image)
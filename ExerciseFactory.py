@@ -1,13 +1,36 @@
 # ExerciseFactory.py
 from exercises.pullup import PullupAnalyser
+from exercises.pushup import PushupAnalyser
+from exercises.squat import SquatAnalyser
+
+# name -> (analyser class, angle points, top threshold, bottom threshold)
+EXERCISES = {
+    "pullup": (PullupAnalyser, (11, 13, 15), 100, 115), # Shoulder, Elbow, Wrist
+    "pushup": (PushupAnalyser, (11, 13, 15), 110, 140), # Shoulder, Elbow, Wrist
+    "squat": (SquatAnalyser, (23, 25, 27), 115, 145),   # Hip, Knee, Ankle
+}
+
+# Plural / folder spellings used by the GUI and exerciseVideos/
+ALIASES = {
+    "pullups": "pullup",
+    "pushups": "pushup",
+    "squats": "squat",
+    "squads": "squat",
+}
 
-def get_exercise(name):
 
-    if name.lower() == "pullup":
-        return PullupAnalyser(), 60, 150
+def resolve_name(name):
+    key = name.lower()
+    key = ALIASES.get(key, key)
+    if key not in EXERCISES:
+        raise ValueError("Exercise not supported")
+    return key
+
+
+def get_exercise(name):
+    analyser_cls, _, top, bottom = EXERCISES[resolve_name(name)]
+    return analyser_cls(), top, bottom
 
-    # Future:
-    # if name.lower() == "pushup":
-    #     return PushUp(), 70, 160
 
-    raise ValueError("Exercise not supported")
\ No newline at end of file
+def get_angle_points(name):
+    return EXERCISES[resolve_name(name)][1]
@@ -0,0 +1,184 @@
+# HudModule.py
+import cv2
+import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+PANEL_COLOR = (20, 20, 20)
+
+
+def progress_percentage(angle):
+    percentage = np.interp(angle, (50, 160), (100, 0))
+    return np.clip(percentage, 0, 100)
+
+
+@lru_cache(maxsize=512)
+def text_size(text, font_scale, thickness):
+    return cv2.getTextSize(text, FONT, font_scale, thickness)
+
+
+# ==============================
+# HUD LAYOUT
+# ==============================
+def hud_elements(img_w, img_h, fps, reps_count, last_tempo, percentage, feedback, stats=None):
+    """
+    The HUD as an ordered list of (name, ops), back to front. Each op is a plain tuple:
+      ("text", text, origin, font_scale, colour, thickness, background)
+      ("rect", pt1, pt2, colour, thickness)
+    draw_hud paints them straight away, HudOverlay caches the text ones.
+    """
+    # Scaling factor and safety margins
+    scale = img_w / 1280
+    font_scale = max(0.6, 0.8 * scale)
+    thickness = max(1, int(2 * scale))
+
+    # Use wider margins to prevent clipping in GUI
+    margin_x = int(img_w * 0.10)
+    margin_y = int(img_h * 0.15)
+
+    # Progress bar geometry
+    bar_x1, bar_y1 = margin_x, margin_y + int(160 * scale)
+    bar_height = int(300 * scale)
+    bar_width = int(40 * scale)
+    filled_h = int(np.interp(percentage, (0, 100), (0, bar_height)))
+
+    # Live feedback lines (bottom left)
+    y_offset = img_h - int(120 * scale)
+    feedback_ops = tuple(
+        ("text", line.strip(), (margin_x, y_offset + i * int(45 * scale)), 0.7 * scale, (255, 255, 0), thickness, PANEL_COLOR)
+        for i, line in enumerate(feedback.split("|"))
+    )
+
+    elements = [
+        ("fps", (("text", f"FPS: {int(fps)}", (margin_x, margin_y), font_scale, (0, 255, 0), thickness, None),)),
+        ("reps", (("text", f"Reps: {int(reps_count)}", (margin_x, margin_y + int(60 * scale)), 1.2 * scale, (255, 0, 0), int(3 * scale), None),)),
+        ("tempo", (("text", f"Tempo: {last_tempo}s", (margin_x, margin_y + int(110 * scale)), 0.8 * scale, (255, 255, 0), int(2 * scale), None),)),
+        ("bar", (("rect", (bar_x1, bar_y1), (bar_x1 + bar_width, bar_y1 + bar_height), (0, 255, 0), thickness),)),
+        ("bar_fill", (("rect", (bar_x1, bar_y1 + bar_height - filled_h), (bar_x1 + bar_width, bar_y1 + bar_height), (0, 255, 0), cv2.FILLED),)),
+        ("percentage", (("text", f"{int(percentage)}%", (bar_x1, bar_y1 - int(15 * scale)), 0.8 * scale, (255, 255, 255), thickness, None),)),
+        ("feedback", feedback_ops),
+    ]
+
+    # Stage timings (top right)
+    if stats:
+        stats_scale = 0.5 * scale
+        line_h = int(25 * scale)
+        x = img_w - margin_x - max(text_size(line, stats_scale, 1)[0][0] for line in stats)
+        panel = ("rect", (x - 10, margin_y - line_h), (img_w - margin_x + 10, margin_y + line_h * (len(stats) - 1) + 10), PANEL_COLOR, cv2.FILLED)
+        lines = tuple(("text", line, (x, margin_y + i * line_h), stats_scale, (0, 255, 255), 1, None) for i, line in enumerate(stats))
+        elements.append(("stats", (panel,) + lines))
+
+    return elements
+
+
+def paint_op(img, op):
+    if op[0] == "rect":
+        _, pt1, pt2, colour, thickness = op
+        cv2.rectangle(img, pt1, pt2, colour, thickness)
+        return
+
+    _, text, (x, y), font_scale, colour, thickness, background = op
+    if background is not None:
+        (text_w, text_h), _ = text_size(text, font_scale, thickness)
+        cv2.rectangle(img, (x - 10, y - text_h - 10), (x + text_w + 10, y + 10), background, cv2.FILLED)
+    cv2.putText(img, text, (x, y), FONT, font_scale, colour, thickness)
+
+
+def draw_hud(img, fps, reps_count, last_tempo, percentage, feedback, stats=None):
+    """
+    Draws the workout HUD (FPS, reps, tempo, progress bar, feedback) onto img.
+    stats: optional profiler lines shown top right.
+    """
+    img_h, img_w = img.shape[:2]
+    for _, ops in hud_elements(img_w, img_h, fps, reps_count, last_tempo, percentage, feedback, stats):
+        for op in ops:
+            paint_op(img, op)
+    return img
+
+
+# ==============================
+# CACHED OVERLAY
+# ==============================
+class HudOverlay:
+    """
+    Same output as draw_hud, but every text block is rendered once into a cached
+    patch keyed by (text, scale, colour, thickness, background) and then put on
+    each frame with a single mask copy (solid patches) or blend (anti-aliased
+    ones). Unchanged text costs no getTextSize or glyph drawing. Rectangles are
+    single cheap calls and are drawn directly.
+    """
+
+    def __init__(self, cache_size=256):
+        self.cache_size = cache_size
+        self.patches = OrderedDict()
+
+    def draw(self, img, fps, reps_count, last_tempo, percentage, feedback, stats=None):
+        img_h, img_w = img.shape[:2]
+        for _, ops in hud_elements(img_w, img_h, fps, reps_count, last_tempo, percentage, feedback, stats):
+            for op in ops:
+                if op[0] != "text" or not self.blit(img, op):
+                    paint_op(img, op)
+        return img
+
+    def blit(self, img, op):
+        x, y = op[2]
+        colour_patch, mask, inv_alpha, left, top = self.render(op)
+        h, w = colour_patch.shape[:2]
+        x0, y0 = x + left, y + top
+        if x0 < 0 or y0 < 0 or x0 + w > img.shape[1] or y0 + h > img.shape[0]:
+            return False # Partly off screen, let cv2 clip it
+
+        roi = img[y0:y0 + h, x0:x0 + w]
+        if inv_alpha is None:
+            cv2.copyTo(colour_patch, mask, roi)
+        else:
+            blend_over(roi, colour_patch, inv_alpha)
+        return True
+
+    def render(self, op):
+        """(colour, mask, inv_alpha, dx, dy) for a text op, cached by content."""
+        _, text, (x, y), font_scale, colour, thickness, background = op
+        key = (text, font_scale, colour, thickness, background)
+        entry = self.patches.get(key)
+        if entry is not None:
+            self.patches.move_to_end(key)
+            return entry
+
+        (text_w, text_h), baseline = text_size(text, font_scale, thickness)
+        pad = thickness + 2
+        left, top = -pad, -text_h - pad
+        right, bottom = text_w + pad, baseline + pad
+        if background is not None:
+            left, top = min(left, -10), min(top, -text_h - 10)
+            right, bottom = max(right, text_w + 11), max(bottom, 11)
+
+        # Drawn on black the op gives colour * alpha; drawn in white on black it gives alpha
+        shifted = shift_op(op, -x - left, -y - top)
+        colour_patch = np.zeros((bottom - top, right - left, 3), dtype=np.uint8)
+        alpha = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        paint_op(colour_patch, shifted)
+        paint_op(alpha, shift_op(shifted, 0, 0, colour=255))
+
+        # Patches without partly covered pixels only need a mask copy
+        inv_alpha = None
+        if np.any((alpha > 0) & (alpha < 255)):
+            inv_alpha = cv2.cvtColor(255 - alpha, cv2.COLOR_GRAY2BGR)
+        entry = (colour_patch, alpha, inv_alpha, left, top)
+        self.patches[key] = entry
+        if len(self.patches) > self.cache_size:
+            self.patches.popitem(last=False)
+        return entry
+
+
+def blend_over(dst, colour, inv_alpha):
+    # dst = dst * (1 - alpha) + colour * alpha, with colour already premultiplied
+    cv2.multiply(dst, inv_alpha, dst=dst, scale=1 / 255)
+    cv2.add(dst, colour, dst=dst)
+
+
+def shift_op(op, dx, dy, colour=None):
+    _, text, (x, y), font_scale, op_colour, thickness, background = op
+    if colour is not None and background is not None:
+        background = colour
+    return ("text", text, (x + dx, y + dy), font_scale, colour if colour is not None else op_colour, thickness, background)
@@ -0,0 +1,117 @@
+# LandmarkCache.py
+import hashlib
+import os
+import numpy as np
+
+import PoseModule as pm
+
+
+class LandmarkCache:
+    """
+    On-disk cache of per-frame landmarks, keyed by the video's content hash plus
+    the poseDetector settings. A hit lets a re-analysis skip inference entirely.
+    The content hash covers the file size and SAMPLES chunks spread from the
+    first to the last byte (the whole file when it is smaller), so keying a
+    large upload costs a few MB of reads instead of a full pass.
+
+    Each entry is one .npz file holding:
+      landmarks  - (T, 33, 4) float32, NaN rows for frames without a pose
+      timestamps - (T,) float64 media time of each frame in ms
+    Least recently used entries are evicted once the folder exceeds max_bytes.
+    """
+
+    SAMPLES = 8
+    SAMPLE_BYTES = 1 << 20
+
+    def __init__(self, cache_dir=".landmark_cache", max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._hashes = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key_for(self, video_path, detector):
+        stat = os.stat(video_path)
+        file_id = (os.path.abspath(video_path), stat.st_size, stat.st_mtime)
+        content_hash = self._hashes.get(file_id)
+        if content_hash is None:
+            content_hash = self._hashes[file_id] = self._content_hash(video_path, stat.st_size)
+
+        settings = repr(sorted(detector.cacheSettings().items()))
+        return hashlib.sha256(f"{content_hash}|{settings}".encode()).hexdigest()
+
+    def _content_hash(self, video_path, size):
+        h = hashlib.sha256(str(size).encode())
+        with open(video_path, 'rb') as f:
+            if size <= self.SAMPLES * self.SAMPLE_BYTES:
+                for chunk in iter(lambda: f.read(self.SAMPLE_BYTES), b""):
+                    h.update(chunk)
+            else:
+                # Head and tail hold the container index (moov / cues), the rest is spot-checked
+                for offset in np.linspace(0, size - self.SAMPLE_BYTES, self.SAMPLES).astype(np.int64):
+                    f.seek(int(offset))
+                    h.update(f.read(self.SAMPLE_BYTES))
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, key):
+        """(landmarks, timestamps) for a cached video, or None on a miss."""
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                entry = data["landmarks"], data["timestamps"]
+            os.utime(path) # Mark as recently used for eviction
+            return entry
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self, key, landmarks, timestamps):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, landmarks=np.asarray(landmarks, dtype=np.float32),
+                     timestamps=np.asarray(timestamps, dtype=np.float64))
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for f in os.listdir(self.cache_dir):
+            if not f.endswith(".npz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, f))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, f))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, f in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, f))
+            except FileNotFoundError:
+                pass # Another worker got there first
+            total -= size
+
+
+class LandmarkRecorder:
+    """Collects a detector's landmarks frame by frame and writes them to the cache."""
+
+    def __init__(self, cache, key):
+        self.cache = cache
+        self.key = key
+        self.rows = []
+        self.timestamps = []
+        self._missing = np.full((pm.NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+
+    def add(self, detector, timestamp_ms):
+        lms = detector.findLandmarks()
+        self.rows.append(lms.copy() if lms is not None else self._missing)
+        self.timestamps.append(timestamp_ms)
+
+    def save(self):
+        if self.rows:
+            self.cache.save(self.key, np.stack(self.rows), self.timestamps)
@@ -0,0 +1,139 @@
+# PipelineModule.py
+import queue
+import threading
+import time
+
+import ProfilerModule
+
+_END_OF_STREAM = object()
+
+
+class FramePipeline:
+    """
+    Runs capture and processing on their own threads, joined by bounded queues.
+    The display side only ever takes the newest finished frame, so throughput is
+    set by the slowest stage instead of the sum of all of them.
+
+    latest_only: for live cameras, a new frame replaces one still waiting for
+    processing instead of queueing behind it, so latency can't build up.
+    Frames carry their capture time (the source's last_timestamp if it has
+    one), recorded against the profiler's "latency" stage once processed.
+
+    process(frame, timestamp) gets timestamp_fn(source) read right after the
+    frame was captured (e.g. its media time), or None without a timestamp_fn.
+    """
+
+    def __init__(self, source, process, queue_size=2, profiler=None, latest_only=False, timestamp_fn=None):
+        self.source = source
+        self.process = process
+        self.timestamp_fn = timestamp_fn
+        self.profiler = profiler or ProfilerModule.StageProfiler()
+        self.latest_only = latest_only
+        self.dropped = 0
+        self.capture_queue = queue.Queue(maxsize=1 if latest_only else queue_size)
+        self.output_queue = queue.Queue(maxsize=1)
+        self.stopped = threading.Event()
+        self.finished = threading.Event()
+        self.error = None
+        self.threads = []
+
+    def start(self):
+        for target in (self._capture_loop, self._process_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=1.0):
+        """
+        Waits for the processing thread to finish its current frame (it owns the
+        session state) and up to timeout seconds for capture, which may be stuck
+        in a device read. Returns True once both threads have ended.
+        """
+        self.stopped.set()
+        capture, process = self.threads or (None, None)
+        if process is not None:
+            process.join()
+            capture.join(timeout)
+        self.threads = [thread for thread in self.threads if thread.is_alive()]
+        return not self.threads
+
+    def get_latest(self):
+        """Newest processed frame, or None if nothing new is ready."""
+        try:
+            return self.output_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    # ==============================
+    # STAGES
+    # ==============================
+    def _capture_loop(self):
+        try:
+            while not self.stopped.is_set():
+                start = self.profiler.mark()
+                success, frame = self.source.read()
+                if not success:
+                    break
+                self.profiler.lap("capture", start)
+                captured = getattr(self.source, "last_timestamp", None) or time.perf_counter()
+                timestamp = self.timestamp_fn(self.source) if self.timestamp_fn is not None else None
+                item = (frame, captured, timestamp)
+                if self.latest_only:
+                    self.dropped += self._replace(self.capture_queue, item)
+                elif not self._put(self.capture_queue, item):
+                    return
+        finally:
+            self._put(self.capture_queue, _END_OF_STREAM)
+
+    def _process_loop(self):
+        try:
+            while not self.stopped.is_set():
+                try:
+                    item = self.capture_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _END_OF_STREAM:
+                    break
+
+                frame, captured, timestamp = item
+                result = self.process(frame, timestamp)
+                if self.profiler.enabled:
+                    self.profiler.record("latency", time.perf_counter() - captured)
+                self._publish(result)
+        except Exception as e:
+            self.error = e
+            print(f"Pipeline processing error: {e}")
+        finally:
+            self.finished.set()
+
+    # ==============================
+    # QUEUE HELPERS
+    # ==============================
+    def _put(self, q, item):
+        # Blocking put that still notices stop()
+        while not self.stopped.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _replace(self, q, item):
+        # Non-blocking put that drops the waiting item; returns how many were dropped
+        dropped = 0
+        try:
+            q.get_nowait()
+            dropped = 1
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
+        return dropped
+
+    def _publish(self, result):
+        # Drop the stale frame so the display never falls behind
+        try:
+            self.output_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.output_queue.put_nowait(result)
@@ -2,9 +2,53 @@ import time
 import mediapipe as mp
 import cv2
 import math
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+# Named joint angles as (point, vertex, point) landmark triplets
+JOINTS = {
+    "left_elbow": (11, 13, 15),
+    "right_elbow": (12, 14, 16),
+    "left_shoulder": (13, 11, 23),
+    "right_shoulder": (14, 12, 24),
+    "left_hip": (11, 23, 25),
+    "right_hip": (12, 24, 26),
+    "left_knee": (23, 25, 27),
+    "right_knee": (24, 26, 28),
+}
+
+
+def joint_triplets(joints):
+    """(K, 3) index array from JOINTS names and/or (p1, p2, p3) triplets."""
+    return np.array([JOINTS[j] if isinstance(j, str) else j for j in joints], dtype=np.intp)
+
+
+def compute_angles(landmarks, triplets):
+    """
+    Joint angles in degrees (0-180) for all triplets in a single NumPy call.
+    landmarks can be one frame (33, 4) or a whole sequence (T, 33, 4);
+    the result is (K,) or (T, K) for K triplets.
+    """
+    idx = np.asarray(triplets, dtype=np.intp)
+    pts = np.asarray(landmarks)[..., idx, :2]
+    a = pts[..., 0, :] - pts[..., 1, :]
+    c = pts[..., 2, :] - pts[..., 1, :]
+
+    angles = np.degrees(np.arctan2(c[..., 1], c[..., 0]) - np.arctan2(a[..., 1], a[..., 0]))
+    angles = np.mod(angles, 360)
+    return np.where(angles > 180, 360 - angles, angles)
+
+
+def compute_visibility(landmarks, triplets):
+    """Visibility of each triplet: the lowest of its three landmarks, shaped like compute_angles."""
+    idx = np.asarray(triplets, dtype=np.intp)
+    return np.asarray(landmarks)[..., idx, 3].min(axis=-1)
 
 class poseDetector():
-    def __init__(self, mode=False, smooth=True, detectionCon=0.5, trackCon=0.5):
+    def __init__(self, mode=False, smooth=True, detectionCon=0.5, trackCon=0.5,
+                 adaptive=False, max_skip=3, motion_threshold=0.006,
+                 roi=False, roi_padding=0.25, inference_size=None):
         self.mode = mode
         self.model_complexity = 1
         self.smooth_landmarks = smooth
@@ -16,30 +60,261 @@ class poseDetector():
         self.mpPose = mp.solutions.pose
         self.pose = self.mpPose.Pose(self.mode,self.model_complexity,self.smooth_landmarks,self.enable_segmentation,self.smooth_segmentation,self.detectionCon,self.trackCon)
 
+        # Landmarks as x, y (pixels), z, visibility - allocated once, reused every frame
+        self.landmarks = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        self.found = False
+        self.results = None
+        self.lmList = []
+        self.triplet_cache = {}
+
+        # Adaptive mode: skip inference while the athlete holds still and
+        # extrapolate landmarks from the last measured joint velocity instead
+        self.adaptive = adaptive
+        self.max_skip = max_skip
+        self.motion_threshold = motion_threshold # per-frame joint travel, fraction of frame diagonal
+        self.last_inferred = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        self.velocity = np.zeros((NUM_LANDMARKS, 2), dtype=np.float32)
+        self.has_history = False
+        self.skip_interval = 0
+        self.frames_since_inference = 0
+        self.probe = None
+        self.frame_count = 0
+        self.inference_count = 0
+
+        # ROI mode: run inference on a padded box around the last pose only
+        self.roi = roi
+        self.roi_padding = roi_padding
+        self.roi_box = None
+
+        # Short side (pixels) frames are downscaled to before inference,
+        # independent of the display resolution; None keeps the source size
+        self.inference_size = inference_size
+
+    def reset(self):
+        # Forget tracking state before starting an unrelated video
+        self.pose.reset()
+        self.found = False
+        self.has_history = False
+        self.skip_interval = 0
+        self.frames_since_inference = 0
+        self.probe = None
+        self.roi_box = None
+
+    def cacheSettings(self):
+        # Everything that changes the landmarks a video produces
+        return {
+            "mode": self.mode,
+            "model_complexity": self.model_complexity,
+            "smooth": self.smooth_landmarks,
+            "detectionCon": self.detectionCon,
+            "trackCon": self.trackCon,
+            "adaptive": (self.max_skip, self.motion_threshold) if self.adaptive else False,
+            "roi": self.roi_padding if self.roi else False,
+            "inference_size": self.inference_size,
+        }
+
     def findPose(self,image,draw=True):
-        imageRGB = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        self.frame_count += 1
+        if self.adaptive and self.canSkipInference(image):
+            self.extrapolateLandmarks()
+        else:
+            self.runInference(image)
+
+        if draw:
+            self.drawSkeleton(image)
+        return image
+
+    def runInference(self, image):
+        h, w = image.shape[:2]
+        box = self.roiBox(w, h) if self.roi else None
+        if box is not None and not self.inferRegion(image, *box):
+            # Tracking lost inside the crop: retry on the full frame
+            box = None
+        if box is None:
+            self.inferRegion(image, 0, 0, w, h)
+        self.roi_box = box if self.found else None
+
+        if self.adaptive:
+            self.probe = self.motionProbe(image)
+            self.updateMotion(image.shape)
+
+    def inferRegion(self, image, x0, y0, x1, y1):
+        crop = image[y0:y1, x0:x1]
+        h, w = crop.shape[:2]
+        # Downscale once, before colour conversion, so both work on fewer pixels
+        if self.inference_size and min(h, w) > self.inference_size:
+            scale = self.inference_size / min(h, w)
+            crop = cv2.resize(crop, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+
+        imageRGB = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
         self.results = self.pose.process(imageRGB)
+        self.inference_count += 1
         # print(self.results.pose_landmarks)
+        # Landmarks are normalised, so scaling by the source size maps them back
+        return self.updateLandmarks((h, w), (x0, y0))
+
+    # ==============================
+    # REGION OF INTEREST
+    # ==============================
+    def roiBox(self, w, h):
+        """Padded box around the last pose, or None to use the full frame."""
+        if not self.found:
+            return None
+        visible = self.landmarks[:, 3] >= 0.5
+        if visible.sum() < 4:
+            return None
+        pts = self.landmarks[visible, :2]
+        x_min, y_min = pts.min(axis=0)
+        x_max, y_max = pts.max(axis=0)
+
+        # Keep the current box while the pose stays well inside it, so the
+        # model's tracker sees a steady frame instead of a jittering crop
+        if self.roi_box is not None:
+            bx0, by0, bx1, by1 = self.roi_box
+            mx, my = 0.1 * (bx1 - bx0), 0.1 * (by1 - by0)
+            if x_min >= bx0 + mx and x_max <= bx1 - mx and y_min >= by0 + my and y_max <= by1 - my:
+                return self.roi_box
+
+        # Square crop: the model expects roughly square input, narrow crops hurt accuracy
+        side = int((1 + 2 * self.roi_padding) * max(x_max - x_min, y_max - y_min))
+        side_w, side_h = min(side, w), min(side, h)
+        cx, cy = int((x_min + x_max) / 2), int((y_min + y_max) / 2)
+        x0 = min(max(0, cx - side_w // 2), w - side_w)
+        y0 = min(max(0, cy - side_h // 2), h - side_h)
+        x1, y1 = x0 + side_w, y0 + side_h
+        if side_w * side_h > 0.8 * w * h:
+            return None # Not worth cropping
+        return (x0, y0, x1, y1)
+
+    # ==============================
+    # ADAPTIVE INFERENCE RATE
+    # ==============================
+    def motionProbe(self, image):
+        # Tiny grayscale thumbnail, cheap enough to compare on every frame
+        thumb = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+    def updateMotion(self, shape):
+        steps = self.frames_since_inference + 1
+        self.frames_since_inference = 0
+        if not self.found:
+            self.has_history = False
+            self.skip_interval = 0
+            return
+
+        if self.has_history:
+            self.velocity[:] = (self.landmarks[:, :2] - self.last_inferred[:, :2]) / steps
+            visible = self.landmarks[:, 3] >= 0.5
+            h, w = shape[:2]
+            speed = np.abs(self.velocity[visible]).max(initial=0.0) / math.hypot(w, h)
+            if speed < self.motion_threshold:
+                self.skip_interval = min(self.max_skip, self.skip_interval + 1)
+            else:
+                self.skip_interval = 0 # Moving again: back to full rate
+
+        self.last_inferred[:] = self.landmarks
+        self.has_history = True
 
-        if draw and self.results.pose_landmarks :
-            self.mpDraw.draw_landmarks(image, self.results.pose_landmarks,self.mpPose.POSE_CONNECTIONS)
+    def canSkipInference(self, image):
+        if not (self.has_history and self.frames_since_inference < self.skip_interval):
+            return False
+
+        # A sudden change in the picture since the last inference means motion picked up
+        if np.abs(self.motionProbe(image) - self.probe).mean() > 8:
+            self.skip_interval = 0
+            return False
+        return True
+
+    def extrapolateLandmarks(self):
+        self.frames_since_inference += 1
+        self.results = None
+        self.found = True
+        self.landmarks[:] = self.last_inferred
+        self.landmarks[:, :2] += self.velocity * self.frames_since_inference
+
+    def updateLandmarks(self, shape, origin=(0, 0)):
+        """
+        Copy the latest results into the reused landmark array.
+        shape is the size of the image given to the model, origin its top-left
+        corner in the full frame (non-zero for ROI crops).
+        """
+        self.found = bool(self.results and self.results.pose_landmarks)
+        if self.found:
+            h, w = shape[:2]
+            lms = self.landmarks
+            for i, lm in enumerate(self.results.pose_landmarks.landmark):
+                lms[i] = (lm.x, lm.y, lm.z, lm.visibility)
+            lms[:, 0] *= w
+            lms[:, 1] *= h
+            lms[:, 0] += origin[0]
+            lms[:, 1] += origin[1]
+        return self.found
+
+    def setLandmarks(self, landmarks):
+        """Use landmarks from elsewhere (e.g. LandmarkCache) instead of running inference."""
+        self.results = None
+        self.found = not np.isnan(landmarks[0, 0])
+        if self.found:
+            self.landmarks[:] = landmarks
+        return self.found
+
+    def drawSkeleton(self, image, scale=1.0):
+        # Same look as mpDraw.draw_landmarks, but drawn from the landmark array
+        # scale maps frame pixels onto image, e.g. when drawing on a downscaled copy
+        if not self.found:
+            return image
+        points = (self.landmarks[:, :2] * scale).astype(np.int32).tolist()
+        visible = (self.landmarks[:, 3] >= 0.5).tolist()
+        for a, b in self.mpPose.POSE_CONNECTIONS:
+            if visible[a] and visible[b]:
+                cv2.line(image, points[a], points[b], (224, 224, 224), 2)
+        for (cx, cy), vis in zip(points, visible):
+            if vis:
+                cv2.circle(image, (cx, cy), 3, (224, 224, 224), 2)
+                cv2.circle(image, (cx, cy), 2, (0, 0, 255), 2)
         return image
 
-    def findPosition(self,image,draw=True):
+    def findLandmarks(self):
+        """
+        (33, 4) float32 array of x, y (pixels), z and visibility for the last frame,
+        or None when no pose was found. The array is reused, copy it to keep it.
+        """
+        return self.landmarks if self.found else None
+
+    def jointTriplets(self, joints):
+        key = tuple(joints)
+        idx = self.triplet_cache.get(key)
+        if idx is None:
+            idx = self.triplet_cache[key] = joint_triplets(joints)
+        return idx
+
+    def findAngles(self, joints):
+        """Angles for several joints at once (JOINTS names or triplets), None without a pose."""
+        if not self.found:
+            return None
+        return compute_angles(self.landmarks, self.jointTriplets(joints))
+
+    def findVisibility(self, joints):
+        """Visibility per joint (lowest of its three landmarks), None without a pose."""
+        if not self.found:
+            return None
+        return compute_visibility(self.landmarks, self.jointTriplets(joints))
+
+    def findPosition(self,image,draw=True,scale=1.0):
         self.lmList = []
-        if self.results.pose_landmarks:
-            for points ,lm in enumerate(self.results.pose_landmarks.landmark):
-                h , w , c = image.shape
-                cx , cy  = int(lm.x * w) , int(lm.y * h)
-                self.lmList.append([points,cx,cy])
-                if draw:
+        if self.found:
+            points = self.landmarks[:, :2].astype(np.int32).tolist()
+            self.lmList = [[i, cx, cy] for i, (cx, cy) in enumerate(points)]
+            if draw:
+                for cx, cy in (self.landmarks[:, :2] * scale).astype(np.int32).tolist():
                     cv2.circle(image , (cx,cy) , 8 , (255,0,0) , cv2.FILLED)
         return self.lmList
 
-    def findAngle(self, image , p1, p2 , p3 , draw = False):
-        x1 , y1 = self.lmList[p1][1:]
-        x2 , y2 = self.lmList[p2][1:]
-        x3 , y3 = self.lmList[p3][1:]
+    def findAngle(self, image , p1, p2 , p3 , draw = False, scale = 1.0):
+        lms = self.landmarks
+        x1 , y1 = float(lms[p1, 0]) , float(lms[p1, 1])
+        x2 , y2 = float(lms[p2, 0]) , float(lms[p2, 1])
+        x3 , y3 = float(lms[p3, 0]) , float(lms[p3, 1])
 
         angle = math.degrees(math.atan2(y3 - y2, x3 - x2) - math.atan2(y1 - y2, x1 - x2))
         if angle < 0:
@@ -49,6 +324,7 @@ class poseDetector():
             angle = 360 - angle
         # print(angle)
         if draw :
+            x1, y1, x2, y2, x3, y3 = (int(v * scale) for v in (x1, y1, x2, y2, x3, y3))
             cv2.line(image,(x1,y1),(x2,y2),(255,255,0),3)
             cv2.line(image,(x3,y3),(x2,y2),(255,255,0),3)
 
@@ -0,0 +1,138 @@
+# ProfilerModule.py
+import json
+import os
+import platform
+import time
+from datetime import datetime
+import numpy as np
+
+# latency: capture time of a frame to its processed result (glass to feedback)
+STAGES = ("capture", "inference", "analysis", "overlay", "display", "latency")
+
+
+class StageProfiler:
+    """
+    Per-stage timings kept in fixed-size ring buffers, so memory stays flat no
+    matter how long a session runs. When disabled, mark() and lap() return
+    straight away and nothing is recorded.
+
+    Usage on the hot path:
+        t = profiler.mark()
+        ...capture...
+        t = profiler.lap("capture", t)
+        ...inference...
+        t = profiler.lap("inference", t)
+    """
+
+    def __init__(self, stages=STAGES, size=300, enabled=False):
+        self.stages = tuple(stages)
+        self.size = size
+        self.enabled = enabled
+        self.buffers = {stage: np.zeros(size) for stage in self.stages}
+        self.counts = dict.fromkeys(self.stages, 0)
+        self._hud_lines = []
+        self._hud_calls = 0
+
+    def reset(self):
+        for stage in self.stages:
+            self.counts[stage] = 0
+        self._hud_lines = []
+        self._hud_calls = 0
+
+    def mark(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def lap(self, stage, since):
+        """Records the time since `since` against stage and returns now, so laps can be chained."""
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self.record(stage, now - since)
+        return now
+
+    def record(self, stage, seconds):
+        # Each stage is only written from one thread, so no lock is needed
+        count = self.counts[stage]
+        self.buffers[stage][count % self.size] = seconds * 1000.0
+        self.counts[stage] = count + 1
+
+    def samples(self, stage):
+        return self.buffers[stage][:min(self.counts[stage], self.size)]
+
+    def stats(self, stage):
+        data = self.samples(stage)
+        if data.size == 0:
+            return {"count": 0}
+        p50, p95 = np.percentile(data, [50, 95])
+        return {
+            "count": self.counts[stage],
+            "mean_ms": round(float(data.mean()), 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "max_ms": round(float(data.max()), 3),
+        }
+
+    def summary(self):
+        return {stage: self.stats(stage) for stage in self.stages}
+
+    def hud_lines(self, refresh=15):
+        """Short per-stage 'p50/p95' lines for the on-screen overlay, recomputed every `refresh` calls."""
+        self._hud_calls += 1
+        if self._hud_lines and self._hud_calls % refresh:
+            return self._hud_lines
+        lines = []
+        for stage in self.stages:
+            data = self.samples(stage)
+            if data.size:
+                p50, p95 = np.percentile(data, [50, 95])
+                lines.append(f"{stage}: {p50:.1f}/{p95:.1f} ms")
+        self._hud_lines = lines
+        return lines
+
+    def dump(self, folder="profiles", label="session", extra=None):
+        """Writes the rolling stats to a timestamped JSON file and returns its path."""
+        report = {
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "window": self.size,
+            "stages": self.summary(),
+        }
+        if extra:
+            report.update(extra)
+
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"profile_{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=4)
+        return path
+
+
+class FpsMeter:
+    """Frame rate averaged over the last `size` frame intervals instead of just the latest one."""
+
+    def __init__(self, size=30):
+        self.size = size
+        self.intervals = np.zeros(size)
+        self.count = 0
+        self.last = None
+
+    def reset(self):
+        self.count = 0
+        self.last = None
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.intervals[self.count % self.size] = now - self.last
+            self.count += 1
+        self.last = now
+        return self.fps()
+
+    def fps(self):
+        n = min(self.count, self.size)
+        total = self.intervals[:n].sum()
+        return n / total if total > 0 else 0.0
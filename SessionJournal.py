@@ -0,0 +1,119 @@
+# SessionJournal.py
+import json
+import os
+import time
+
+JOURNAL_DIR = os.path.join("sessions", "journal")
+
+
+class SessionJournal:
+    """
+    Append-only JSONL journal of the workout in progress, so a crash or a
+    killed kiosk loses at most the last unflushed reps instead of the session.
+
+    The first line is a header {"type": "session", "exercise", "date"}, then one
+    {"type": "rep", ...} line per rep. The file is created on the first rep.
+    Lines are flushed to the OS every flush_every reps and fsynced at most every
+    fsync_interval seconds (0 = on every flush). Each append costs O(1).
+    Once the session is safely in the SessionStore the journal is discarded;
+    anything left behind is picked up by recover() on the next start.
+    """
+
+    def __init__(self, exercise, date, folder=JOURNAL_DIR, flush_every=1, fsync_interval=5.0):
+        self.exercise = exercise
+        self.date = date
+        self.folder = folder
+        self.flush_every = flush_every
+        self.fsync_interval = fsync_interval
+        stamp = date.replace("-", "").replace(":", "").replace(" ", "_")
+        self.name = f"journal_{exercise}_{stamp}_{os.getpid()}.jsonl"
+        self.path = os.path.join(folder, self.name)
+        self.file = None
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def append(self, entry):
+        if self.file is None:
+            os.makedirs(self.folder, exist_ok=True)
+            self.file = open(self.path, 'a', encoding="utf-8")
+            self._write({"type": "session", "exercise": self.exercise, "date": self.date})
+        self._write(dict(entry, type="rep"))
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def flush(self, sync=False):
+        if self.file is None:
+            return
+        self.file.flush()
+        self.pending = 0
+        now = time.monotonic()
+        if sync or now - self.last_sync >= self.fsync_interval:
+            os.fsync(self.file.fileno())
+            self.last_sync = now
+
+    def close(self):
+        if self.file is not None:
+            self.flush(sync=True)
+            self.file.close()
+            self.file = None
+
+    def discard(self):
+        """Closes and deletes the journal once its session has been stored."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def read_journal(path):
+    """(header, reps) from a journal file. A torn last line from a crash is dropped."""
+    header, reps = None, []
+    with open(path, 'r', encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue # Partly written line
+            kind = record.pop("type", None)
+            if kind == "session":
+                header = record
+            elif kind == "rep":
+                reps.append(record)
+    return header, reps
+
+
+def recover(store, folder=JOURNAL_DIR):
+    """
+    Moves sessions left in journals by a crash into the SessionStore and removes
+    the journals. Returns how many sessions were recovered.
+    """
+    if not os.path.isdir(folder):
+        return 0
+
+    recovered = 0
+    for name in sorted(os.listdir(folder)):
+        if not name.endswith(".jsonl"):
+            continue
+        path = os.path.join(folder, name)
+        try:
+            header, reps = read_journal(path)
+        except OSError as e:
+            print(f"Could not read journal {name}: {e}")
+            continue
+
+        if header is not None and reps:
+            if store.has_source(name):
+                pass # Stored before the crash, only the cleanup was missed
+            else:
+                store.save_session(header["exercise"], reps, header["date"], source=name)
+                recovered += 1
+                print(f"Recovered {len(reps)} reps of {header['exercise']} from {header['date']}")
+        os.remove(path)
+    return recovered
@@ -0,0 +1,170 @@
+# SessionStore.py
+import json
+import os
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id           INTEGER PRIMARY KEY,
+    exercise     TEXT NOT NULL,
+    date         TEXT NOT NULL,      -- "YYYY-MM-DD HH:MM:SS", sorts chronologically
+    total_reps   INTEGER NOT NULL,
+    correct_reps INTEGER NOT NULL,
+    source       TEXT UNIQUE         -- JSON file or journal it came from, stops double imports
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+CREATE INDEX IF NOT EXISTS idx_sessions_exercise_date ON sessions(exercise, date);
+
+CREATE TABLE IF NOT EXISTS reps (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    rep_num    INTEGER NOT NULL,
+    timestamp  TEXT,
+    rom        REAL,
+    tempo      REAL,
+    success    INTEGER NOT NULL,
+    feedback   TEXT NOT NULL,        -- JSON list of strings
+    PRIMARY KEY (session_id, rep_num)
+);
+
+-- Running totals per exercise, kept up to date by triggers
+CREATE TABLE IF NOT EXISTS exercise_totals (
+    exercise     TEXT PRIMARY KEY,
+    sessions     INTEGER NOT NULL,
+    total_reps   INTEGER NOT NULL,
+    correct_reps INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS trg_sessions_insert AFTER INSERT ON sessions BEGIN
+    INSERT INTO exercise_totals (exercise, sessions, total_reps, correct_reps)
+    VALUES (NEW.exercise, 1, NEW.total_reps, NEW.correct_reps)
+    ON CONFLICT(exercise) DO UPDATE SET
+        sessions = sessions + 1,
+        total_reps = total_reps + NEW.total_reps,
+        correct_reps = correct_reps + NEW.correct_reps;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_sessions_delete AFTER DELETE ON sessions BEGIN
+    UPDATE exercise_totals SET
+        sessions = sessions - 1,
+        total_reps = total_reps - OLD.total_reps,
+        correct_reps = correct_reps - OLD.correct_reps
+    WHERE exercise = OLD.exercise;
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SessionStore:
+    """
+    Workout sessions in one SQLite database (WAL mode) instead of a JSON file
+    per session. The latest sessions come straight off the date index and
+    per-exercise success rates from trigger-maintained totals, so neither
+    slows down as history grows.
+    Safe to share between the Tk thread and the chat thread.
+    """
+
+    def __init__(self, path=os.path.join("sessions", "sessions.db")):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ==============================
+    # WRITING
+    # ==============================
+    def save_session(self, exercise, reps, date, source=None):
+        """Stores a session and its rep entries (MainApp.session_data format), returns its id."""
+        with self.lock, self.conn:
+            return self._insert(exercise, reps, date, source)
+
+    def _insert(self, exercise, reps, date, source):
+        correct = sum(1 for r in reps if r.get("success"))
+        cur = self.conn.execute(
+            "INSERT INTO sessions (exercise, date, total_reps, correct_reps, source) VALUES (?, ?, ?, ?, ?)",
+            (exercise, date, len(reps), correct, source))
+        session_id = cur.lastrowid
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO reps (session_id, rep_num, timestamp, rom, tempo, success, feedback) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(session_id, r.get("rep_num", i + 1), r.get("timestamp"), r.get("rom"), r.get("tempo"),
+              int(bool(r.get("success"))), json.dumps(r.get("feedback", []))) for i, r in enumerate(reps)])
+        return session_id
+
+    def import_json_dir(self, folder="sessions"):
+        """
+        One-time import of the old session_*.json files. Runs once per database;
+        files that were already imported are skipped if it is ever forced again.
+        """
+        with self.lock:
+            done = self.conn.execute("SELECT value FROM meta WHERE key = 'json_imported'").fetchone()
+        if done is not None or not os.path.isdir(folder):
+            return 0
+
+        imported = 0
+        with self.lock, self.conn:
+            known = {row[0] for row in self.conn.execute("SELECT source FROM sessions WHERE source IS NOT NULL")}
+            for f in sorted(os.listdir(folder)):
+                if not f.endswith(".json") or f in known:
+                    continue
+                try:
+                    with open(os.path.join(folder, f), 'r') as file:
+                        data = json.load(file)
+                    self._insert(data.get("exercise", "unknown"), data.get("reps", []), data.get("date", ""), f)
+                    imported += 1
+                except (OSError, ValueError, AttributeError) as e:
+                    print(f"Skipping session file {f}: {e}")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)", (str(imported),))
+        return imported
+
+    # ==============================
+    # QUERIES
+    # ==============================
+    def has_source(self, source):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM sessions WHERE source = ?", (source,)).fetchone() is not None
+
+    def latest_sessions(self, limit=3, exercise=None):
+        """Newest sessions first, each a dict with its reps (feedback decoded)."""
+        query = "SELECT * FROM sessions"
+        params = []
+        if exercise is not None:
+            query += " WHERE exercise = ?"
+            params.append(exercise)
+        query += " ORDER BY date DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            sessions = [dict(row) for row in self.conn.execute(query, params)]
+            for session in sessions:
+                rows = self.conn.execute("SELECT * FROM reps WHERE session_id = ? ORDER BY rep_num", (session["id"],))
+                session["reps"] = [dict(row, success=bool(row["success"]), feedback=json.loads(row["feedback"])) for row in rows]
+        return sessions
+
+    def success_rate(self, exercise=None):
+        """{exercise: {"sessions", "total_reps", "correct_reps", "rate"}} over all stored sessions."""
+        query = "SELECT exercise, sessions, total_reps, correct_reps FROM exercise_totals WHERE sessions > 0"
+        params = []
+        if exercise is not None:
+            query += " AND exercise = ?"
+            params.append(exercise)
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return {
+            name: {"sessions": count, "total_reps": total, "correct_reps": correct,
+                   "rate": correct / total if total else 0.0}
+            for name, count, total, correct in rows
+        }
@@ -0,0 +1,169 @@
+# StreamModule.py
+import collections
+import cv2
+
+import ProfilerModule
+from LandmarkCache import LandmarkRecorder
+
+# Items passed between the stages. Timestamps are media time in ms: position in
+# the video for files, capture time for cameras (None = not known). landmarks
+# is the detector's reused array: valid until the stream is advanced, copy it
+# to keep it.
+FramePacket = collections.namedtuple("FramePacket", "index timestamp image")
+PosePacket = collections.namedtuple("PosePacket", "index timestamp image landmarks")
+# joint_visibility: per analyser joint, the lowest visibility of its landmarks
+AnglePacket = collections.namedtuple("AnglePacket", "index timestamp image landmarks angle joint_angles joint_visibility",
+                                     defaults=(None,))
+# result: analyse_rep() dict when rep_done, live_feedback: analyser hint otherwise
+RepUpdate = collections.namedtuple("RepUpdate", "index timestamp image angle reps_count rep_done result live_feedback")
+
+_DISABLED = ProfilerModule.StageProfiler()
+
+
+# ==============================
+# SOURCES
+# ==============================
+def capture_timestamp(source):
+    """
+    Timestamp (ms) of the frame just read from source: the capture time for
+    live readers (cameraModule.LatestFrameReader), media position for files.
+    """
+    captured = getattr(source, "last_timestamp", None)
+    if captured is not None:
+        return captured * 1000.0
+    return source.get(cv2.CAP_PROP_POS_MSEC)
+
+
+def video_frames(source):
+    """
+    FramePackets from a video path (opened and released here) or an open
+    capture, decoded one at a time, timestamped with CAP_PROP_POS_MSEC.
+    """
+    cap = cv2.VideoCapture(source) if isinstance(source, str) else source
+    if not cap.isOpened():
+        raise IOError(f"Could not open video {source}")
+    try:
+        index = 0
+        while True:
+            success, frame = cap.read()
+            if not success:
+                break
+            yield FramePacket(index, cap.get(cv2.CAP_PROP_POS_MSEC), frame)
+            index += 1
+    finally:
+        if isinstance(source, str):
+            cap.release()
+
+
+class Feed:
+    """
+    Push-style source for callers that get items one at a time (a GUI frame
+    callback, results coming back from a worker): push() an item, then take
+    its result with next() on the stream built on top. Every stage yields
+    exactly one item per input, so the item is always there when pulled;
+    pulling with nothing pushed is a bug and raises instead of quietly ending
+    the stream (which would leave every later next() with StopIteration).
+    """
+
+    def __init__(self):
+        self.pending = collections.deque()
+
+    def push(self, item):
+        self.pending.append(item)
+
+    def __iter__(self):
+        while True:
+            if not self.pending:
+                raise RuntimeError("Feed pulled with nothing pushed: push() an item before each next()")
+            yield self.pending.popleft()
+
+
+# ==============================
+# STAGES
+# ==============================
+def landmarks(frames, detector, cached=None, profiler=None):
+    """
+    FramePackets -> PosePackets. Runs pose inference on each frame, or loads
+    cached[index] (rows from the LandmarkCache) while the cache covers it.
+    """
+    profiler = profiler or _DISABLED
+    for frame in frames:
+        t = profiler.mark()
+        if cached is not None and frame.index < len(cached):
+            detector.setLandmarks(cached[frame.index])
+        else:
+            detector.findPose(frame.image, draw=False)
+        profiler.lap("inference", t)
+        yield PosePacket(frame.index, frame.timestamp, frame.image, detector.findLandmarks())
+
+
+def cached_poses(rows, timestamps, detector):
+    """PosePackets straight from a LandmarkCache entry: no decoding, no inference, no images."""
+    for index, (row, timestamp) in enumerate(zip(rows, timestamps)):
+        detector.setLandmarks(row)
+        yield PosePacket(index, float(timestamp), None, detector.findLandmarks())
+
+
+def video_poses(video_path, detector, cache=None):
+    """
+    PosePackets for a video file. With a cache hit no frame is decoded and no
+    inference runs; otherwise the landmarks are recorded and cached once the
+    whole video went through.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key_for(video_path, detector)
+        entry = cache.load(key)
+        if entry is not None:
+            yield from cached_poses(*entry, detector)
+            return
+
+    recorder = LandmarkRecorder(cache, key) if cache is not None else None
+    for pose in landmarks(video_frames(video_path), detector):
+        if recorder is not None:
+            recorder.add(detector, pose.timestamp)
+        yield pose
+
+    # Only complete runs are worth caching
+    if recorder is not None:
+        recorder.save()
+
+
+def angles(poses, detector, angle_points, joints=()):
+    """PosePackets -> AnglePackets with the tracked angle and the analyser's joint angles and visibility (None without a pose)."""
+    p1, p2, p3 = angle_points
+    for pose in poses:
+        angle = joint_angles = joint_visibility = None
+        if pose.landmarks is not None:
+            angle = detector.findAngle(None, p1, p2, p3)
+            if joints:
+                joint_angles = detector.findAngles(joints)
+                joint_visibility = detector.findVisibility(joints)
+        yield AnglePacket(pose.index, pose.timestamp, pose.image, pose.landmarks, angle, joint_angles, joint_visibility)
+
+
+def analyse(angle_packets, counter, analyser=None, profiler=None):
+    """AnglePackets -> RepUpdates: counts reps with the RepCounter and scores them with the analyser."""
+    profiler = profiler or _DISABLED
+    for packet in angle_packets:
+        t = profiler.mark()
+        reps_count, rep_done = counter.rep_count, False
+        result = live_feedback = None
+        if packet.angle is not None:
+            seconds = packet.timestamp / 1000.0 if packet.timestamp is not None else None
+            if analyser is not None:
+                analyser.update(packet.angle, packet.joint_angles, seconds, packet.joint_visibility)
+            reps_count, rep_done = counter.update(packet.angle)
+            if analyser is not None:
+                if rep_done:
+                    result = analyser.analyse_rep()
+                else:
+                    live_feedback = analyser.get_live_feedback(packet.angle)
+        profiler.lap("analysis", t)
+        yield RepUpdate(packet.index, packet.timestamp, packet.image, packet.angle,
+                        reps_count, rep_done, result, live_feedback)
+
+
+def rep_events(updates):
+    """Only the RepUpdates that complete a rep."""
+    return (update for update in updates if update.rep_done)
@@ -1,71 +1,199 @@
+import argparse
 import cv2
+import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 
 # Add project root to path to import modules
-sys.path.append('d:/Projects/AIPersonalTrainerProject')
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(PROJECT_ROOT)
 
 import PoseModule as pm
 import RepCounterModule as rep
-from exercises.pullup import PullupAnalyser
+import ExerciseFactory
+import StreamModule
+from LandmarkCache import LandmarkCache
 
-def analyze_video(video_path):
-    print(f"\nAnalyzing: {video_path}")
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print(f"Error: Could not open video {video_path}")
-        return []
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+
+
+def video_landmarks(video_path, detector, cache=None):
+    """
+    Yields once per frame (the timestamp in ms) with the frame's landmarks
+    loaded into the detector. With a cache hit no frame is decoded and no
+    inference runs.
+    """
+    for pose in StreamModule.video_poses(video_path, detector, cache):
+        yield pose.timestamp
+
+
+def analyze_video(video_path, exercise="pullup", detector=None, verbose=True, cache=None):
+    if verbose:
+        print(f"\nAnalyzing: {video_path}")
+
+    if detector is None:
+        detector = pm.poseDetector()
+    analyser, top, bottom = ExerciseFactory.get_exercise(exercise)
+    angle_points = ExerciseFactory.get_angle_points(exercise)
+    counter = rep.RepCounter(top_threshold=top, bottom_threshold=bottom)
 
-    detector = pm.poseDetector()
-    counter = rep.RepCounter(top_threshold=100, bottom_threshold=115)
-    analyser = PullupAnalyser()
-    
     rep_results = []
     video_min = 180.0
     video_max = 0.0
-    
-    while cap.isOpened():
-        success, frame = cap.read()
-        if not success:
-            break
-            
-        frame = detector.findPose(frame, draw=False)
-        lmList = detector.findPosition(frame, draw=False)
-        
-        if len(lmList) != 0:
-            angle = detector.findAngle(frame, 11, 13, 15, draw=False)
-            video_min = min(video_min, float(angle))
-            video_max = max(video_max, float(angle))
-            
-            analyser.update(angle)
-            reps_count, rep_done = counter.update(angle)
-            
-            if rep_done:
-                result = analyser.analyse_rep()
-                rep_results.append(result)
-                print(f"Rep {reps_count}: {result['feedback']}")
-
-    cap.release()
-    print(f"Video ROM: Min={video_min:.1f}, Max={video_max:.1f}, Range={video_max-video_min:.1f}")
-    
+
+    poses = StreamModule.video_poses(video_path, detector, cache)
+    updates = StreamModule.analyse(StreamModule.angles(poses, detector, angle_points, analyser.JOINTS), counter, analyser)
+    try:
+        for update in updates:
+            if update.angle is None:
+                continue
+
+            video_min = min(video_min, float(update.angle))
+            video_max = max(video_max, float(update.angle))
+
+            if update.rep_done:
+                rep_results.append(update.result)
+                if verbose:
+                    print(f"Rep {update.reps_count}: {update.result['feedback']}")
+    except IOError as e:
+        print(f"Error: {e}")
+        return []
+
+    if verbose:
+        print(f"Video ROM: Min={video_min:.1f}, Max={video_max:.1f}, Range={video_max-video_min:.1f}")
+
     if not rep_results:
         # Check what the analyser says about the partial movement
         result = analyser.analyse_rep()
-        print(f"Final partial analysis: {result['feedback']}")
+        result["partial"] = True
+        if verbose:
+            print(f"Final partial analysis: {result['feedback']}")
         rep_results.append(result)
-        
+
     return rep_results
 
+
+# ==============================
+# BATCH MODE
+# ==============================
+def infer_exercise(video_path, default=None):
+    # Walk up the folder names (e.g. exerciseVideos/Pullups/...) looking for an exercise
+    folder = os.path.dirname(os.path.abspath(video_path))
+    while True:
+        try:
+            return ExerciseFactory.resolve_name(os.path.basename(folder))
+        except ValueError:
+            parent = os.path.dirname(folder)
+            if parent == folder:
+                return default
+            folder = parent
+
+
+def exercise_arg(name):
+    # argparse type for --exercise: fails at parse time instead of mid-run
+    try:
+        return ExerciseFactory.resolve_name(name)
+    except ValueError:
+        choices = ", ".join(sorted(ExerciseFactory.EXERCISES))
+        raise argparse.ArgumentTypeError(f"unknown exercise '{name}' (choose from {choices})")
+
+
+def find_videos(paths):
+    videos = []
+    for path in paths:
+        if os.path.isfile(path):
+            videos.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for f in sorted(files):
+                if f.lower().endswith(VIDEO_EXTENSIONS):
+                    videos.append(os.path.join(root, f))
+    return videos
+
+
+_worker_detector = None
+_worker_cache = None
+
+
+def _init_worker(cache_dir=None):
+    # One detector per worker process, reused for every video it gets
+    global _worker_detector, _worker_cache
+    cv2.setNumThreads(1) # The pool already saturates the cores
+    _worker_detector = pm.poseDetector()
+    _worker_cache = LandmarkCache(cache_dir) if cache_dir else None
+
+
+def _analyze_job(video_path, exercise):
+    _worker_detector.reset()
+    return analyze_video(video_path, exercise, detector=_worker_detector, verbose=False, cache=_worker_cache)
+
+
+def summarize_results(exercise, rep_results):
+    reps = [r for r in rep_results if not r.get("partial")]
+    return {
+        "exercise": exercise,
+        "total_reps": len(reps),
+        "correct_reps": sum(1 for r in reps if r.get("formCorrect")),
+        "reps": rep_results
+    }
+
+
+def analyze_batch(paths, exercise=None, workers=None, output="analysis_summary.json", cache_dir=".landmark_cache"):
+    jobs = []
+    for video in find_videos(paths):
+        video_exercise = exercise or infer_exercise(video)
+        if video_exercise is None:
+            print(f"Skipping {video}: cannot tell which exercise it shows (use --exercise)")
+            continue
+        jobs.append((video, ExerciseFactory.resolve_name(video_exercise)))
+
+    if not jobs:
+        print("No videos found.")
+        return {}
+
+    # Each worker loads its own pose model, so never start more than there are videos
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    print(f"Analyzing {len(jobs)} videos with {workers} workers...")
+
+    videos = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_dir,)) as pool:
+        futures = {pool.submit(_analyze_job, video, ex): (video, ex) for video, ex in jobs}
+        for future in as_completed(futures):
+            video, ex = futures[future]
+            try:
+                entry = summarize_results(ex, future.result())
+                print(f"{video}: {entry['total_reps']} reps ({entry['correct_reps']} correct)")
+            except Exception as e:
+                entry = {"exercise": ex, "error": str(e)}
+                print(f"{video}: failed - {e}")
+            videos[video] = entry
+
+    summary = {
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_videos": len(jobs),
+        "videos": {video: videos[video] for video, _ in jobs}
+    }
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(summary, f, indent=4)
+        print(f"Summary saved to {output}")
+    return summary
+
+
 if __name__ == "__main__":
-    videos = [
-        "d:/Projects/AIPersonalTrainerProject/exerciseVideos/Pullups/Pullup_Front_Incorrect_2.mp4",
-        "d:/Projects/AIPersonalTrainerProject/exerciseVideos/Pullups/Pullup_Front_Incorrect_3.mp4"
-    ]
-    
-    all_feedback = {}
-    for video in videos:
-        if os.path.exists(video):
-            results = analyze_video(video)
-            all_feedback[os.path.basename(video)] = results
-        else:
-            print(f"File not found: {video}")
+    parser = argparse.ArgumentParser(description="Headless rep analysis over exercise videos.")
+    parser.add_argument("paths", nargs="*", default=[os.path.join(PROJECT_ROOT, "exerciseVideos")],
+                        help="Video files or folders to scan (default: exerciseVideos/)")
+    parser.add_argument("--exercise", type=exercise_arg, help="Force one exercise instead of inferring it from folder names")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per video, up to CPU count)")
+    parser.add_argument("--output", default="analysis_summary.json", help="Summary JSON path")
+    parser.add_argument("--cache-dir", default=".landmark_cache", help="Landmark cache folder")
+    parser.add_argument("--no-cache", action="store_true", help="Always run pose inference")
+    args = parser.parse_args()
+
+    analyze_batch(args.paths, exercise=args.exercise, workers=args.workers, output=args.output,
+                  cache_dir=None if args.no_cache else args.cache_dir)
@@ -0,0 +1,187 @@
+import argparse
+import cv2
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+
+# Add project root to path to import modules
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(PROJECT_ROOT)
+
+import mediapipe as mp
+import PoseModule as pm
+import ProfilerModule
+import RepCounterModule as rep
+import ExerciseFactory
+import DisplayModule
+import HudModule
+import analyze_form
+
+STAGES = ("decode", "cvtColor", "pose_process", "landmarks", "analyser", "rep_counter", "overlay", "display")
+
+
+def benchmark_video(video_path, exercise, detector, timings, warmup=10, max_frames=None, render_at_display=True):
+    """
+    Runs one video through the same per-frame work as MainApp, timing each stage
+    separately. Appends per-frame milliseconds to timings[stage] and returns the frame count.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video {video_path}")
+
+    analyser, top, bottom = ExerciseFactory.get_exercise(exercise)
+    p1, p2, p3 = ExerciseFactory.get_angle_points(exercise)
+    counter = rep.RepCounter(top_threshold=top, bottom_threshold=bottom)
+    detector.reset()
+    hud = HudModule.HudOverlay()
+    display = DisplayModule.FrameDisplay() # No Tk here, so the final PhotoImage paste is not timed
+    fps_meter = ProfilerModule.FpsMeter() # Same averaged frame rate the GUI puts on the HUD
+
+    clock = time.perf_counter
+    frames = 0
+    feedback = "Start your workout"
+    last_tempo = 0
+    while max_frames is None or frames < max_frames:
+        fps = fps_meter.tick()
+        t0 = clock()
+        success, frame = cap.read()
+        t1 = clock()
+        if not success:
+            break
+        timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+        imageRGB = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        t2 = clock()
+
+        detector.results = detector.pose.process(imageRGB)
+        t3 = clock()
+
+        found = detector.updateLandmarks(frame.shape)
+        if found:
+            angle = detector.findAngle(frame, p1, p2, p3)
+            joint_angles = detector.findAngles(analyser.JOINTS) if analyser.JOINTS else None
+            joint_visibility = detector.findVisibility(analyser.JOINTS) if analyser.JOINTS else None
+        t4 = clock()
+
+        if found:
+            analyser.update(angle, joint_angles, timestamp, joint_visibility)
+        t5 = clock()
+
+        rep_done = False
+        if found:
+            _, rep_done = counter.update(angle)
+        t6 = clock()
+
+        if rep_done:
+            result = analyser.analyse_rep()
+            feedback = " | ".join(result["feedback"])
+            last_tempo = result["repTime"]
+        elif found:
+            feedback = analyser.get_live_feedback(angle)
+        t7 = clock()
+
+        canvas, scale = DisplayModule.downscale(frame) if render_at_display else (frame, 1.0)
+        detector.drawSkeleton(canvas, scale)
+        percentage = 0
+        if found:
+            detector.findAngle(canvas, p1, p2, p3, draw=True, scale=scale)
+            percentage = HudModule.progress_percentage(angle)
+        hud.draw(canvas, fps, counter.rep_count, last_tempo, percentage, feedback)
+        t8 = clock()
+
+        display.prepare(canvas)
+        t9 = clock()
+
+        frames += 1
+        if frames <= warmup:
+            continue # Model and caches are still warming up
+        for stage, start, end in (("decode", t0, t1), ("cvtColor", t1, t2), ("pose_process", t2, t3),
+                                  ("landmarks", t3, t4), ("analyser", t4, t5), ("rep_counter", t5, t6),
+                                  ("overlay", t7, t8), ("display", t8, t9)):
+            timings[stage].append((end - start) * 1000)
+        # analyse_rep / live feedback is analyser work too
+        timings["analyser"][-1] += (t7 - t6) * 1000
+        timings["end_to_end"].append((t9 - t0) * 1000)
+
+    cap.release()
+    return frames
+
+
+def summarize(samples):
+    data = np.asarray(samples, dtype=np.float64)
+    if data.size == 0:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(data, [50, 95, 99])
+    return {
+        "count": int(data.size),
+        "mean_ms": round(float(data.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+    }
+
+
+def run_benchmark(paths, exercise=None, warmup=10, max_frames=None, render_at_display=True):
+    timings = {stage: [] for stage in STAGES}
+    timings["end_to_end"] = []
+    detector = pm.poseDetector()
+
+    videos = []
+    for video in analyze_form.find_videos(paths):
+        video_exercise = exercise or analyze_form.infer_exercise(video)
+        if video_exercise is None:
+            continue
+        start = time.perf_counter()
+        try:
+            frames = benchmark_video(video, video_exercise, detector, timings, warmup, max_frames, render_at_display)
+        except IOError as e:
+            print(f"Skipping {video}: {e}", file=sys.stderr) # stdout may carry the JSON report
+            continue
+        videos.append({
+            "path": os.path.relpath(video, PROJECT_ROOT),
+            "exercise": ExerciseFactory.resolve_name(video_exercise),
+            "frames": frames,
+            "seconds": round(time.perf_counter() - start, 3),
+        })
+
+    measured = len(timings["end_to_end"])
+    total_ms = sum(timings["end_to_end"])
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "opencv": cv2.__version__,
+            "mediapipe": mp.__version__,
+        },
+        "render_at_display": render_at_display,
+        "videos": videos,
+        "stages": {stage: summarize(timings[stage]) for stage in STAGES},
+        "end_to_end": summarize(timings["end_to_end"]),
+        "throughput_fps": round(measured / (total_ms / 1000), 2) if total_ms else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless per-stage latency benchmark over exercise videos.")
+    parser.add_argument("paths", nargs="*", default=[os.path.join(PROJECT_ROOT, "exerciseVideos")],
+                        help="Video files or folders to run (default: exerciseVideos/)")
+    parser.add_argument("--exercise", type=analyze_form.exercise_arg, help="Force one exercise instead of inferring it from folder names")
+    parser.add_argument("--warmup", type=int, default=10, help="Frames per video left out of the stats")
+    parser.add_argument("--max-frames", type=int, default=None, help="Stop each video after this many frames")
+    parser.add_argument("--render-at-source", action="store_true", help="Draw overlays on the source frame before resizing (old behaviour)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.paths, exercise=args.exercise, warmup=args.warmup, max_frames=args.max_frames,
+                           render_at_display=not args.render_at_source)
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+        print(f"Benchmark saved to {args.output}")
+    else:
+        print(text)
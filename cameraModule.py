@@ -1,4 +1,10 @@
-import cv2
+import json
+import os
+import threading
+import time
+
+# cv2 is imported inside the functions that open devices, so the GUI can show
+# cached cameras before OpenCV has finished loading
 
 # Try to get camera names (Windows only)
 try:
@@ -8,21 +14,154 @@ except:
     WINDOWS_SUPPORT = False
 
 
+CACHE_PATH = ".camera_cache.json"
+
+# Resolutions tried on every camera; the driver reports what it actually set
+PROBE_RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+
+# Indexes whose probe is still running (e.g. a driver that hangs)
+_probing = set()
+_probing_lock = threading.Lock()
+
+
 # ==============================
 # LIST AVAILABLE CAMERAS
 # ==============================
+def probe_camera(index):
+    """Supported resolutions of camera index (sorted list of [w, h]), or None if it doesn't open."""
+    import cv2
+    cap = cv2.VideoCapture(index, cv2.CAP_DSHOW if WINDOWS_SUPPORT else 0)
+    try:
+        if not cap.isOpened():
+            return None
+        resolutions = set()
+        for w, h in PROBE_RESOLUTIONS:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, w)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, h)
+            actual = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            if actual[0] > 0 and actual[1] > 0:
+                resolutions.add(actual)
+        return [list(r) for r in sorted(resolutions)]
+    finally:
+        cap.release()
+
+
+def discover_cameras(max_tested=5, timeout=3.0):
+    """
+    Probes indexes 0..max_tested-1 concurrently, one daemon thread each, and
+    returns [{"index", "name", "resolutions"}] for the cameras that opened.
+    A probe still running after timeout seconds counts as no camera; its
+    thread is left to finish on its own and the index is skipped until then.
+    """
+    results = {}
+
+    def probe(index):
+        try:
+            results[index] = probe_camera(index)
+        except Exception as e:
+            print(f"Camera {index} probe failed: {e}")
+        finally:
+            with _probing_lock:
+                _probing.discard(index)
+
+    threads = []
+    with _probing_lock:
+        for i in range(max_tested):
+            if i in _probing:
+                continue
+            _probing.add(i)
+            thread = threading.Thread(target=probe, args=(i,), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    found = dict(results) # Late probes may still write to results
+    names = get_camera_names()
+    return [
+        {"index": i, "name": get_camera_name(i, names), "resolutions": resolutions}
+        for i, resolutions in sorted(found.items()) if resolutions is not None
+    ]
+
+
 def list_cameras(max_tested=5):
-    available = []
+    return [camera["index"] for camera in discover_cameras(max_tested)]
 
-    for i in range(max_tested):
-        cap = cv2.VideoCapture(i, cv2.CAP_DSHOW if WINDOWS_SUPPORT else 0)
 
-        if cap.isOpened():
-            available.append(i)
+class CameraRegistry:
+    """
+    Discovered cameras, cached in memory and in a JSON file for ttl seconds so
+    the source screen can list them instantly. get() returns the cached list
+    (None if nothing was ever probed) and starts a background refresh when it
+    is missing or stale; on_update(cameras) is called from that thread.
+    """
 
-        cap.release()
+    def __init__(self, ttl=300.0, cache_path=CACHE_PATH, max_tested=5, timeout=3.0):
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.max_tested = max_tested
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.cameras = None
+        self.probed_at = 0.0
+        self.refreshing = False
+        self.listeners = []
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding="utf-8") as f:
+                data = json.load(f)
+            self.cameras = data["cameras"]
+            self.probed_at = float(data["probed_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
 
-    return available
+    def _save(self):
+        try:
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w', encoding="utf-8") as f:
+                json.dump({"probed_at": self.probed_at, "cameras": self.cameras}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Could not cache camera list: {e}")
+
+    def stale(self):
+        return self.cameras is None or time.time() - self.probed_at > self.ttl
+
+    def get(self, on_update=None):
+        with self.lock:
+            cameras = self.cameras
+        if self.stale():
+            self.refresh(on_update)
+        return cameras
+
+    def refresh(self, on_update=None):
+        """Re-probes on a background thread; joins the running refresh if there is one."""
+        with self.lock:
+            if on_update is not None:
+                self.listeners.append(on_update)
+            if self.refreshing:
+                return
+            self.refreshing = True
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        cameras = None
+        try:
+            cameras = discover_cameras(self.max_tested, self.timeout)
+            with self.lock:
+                self.cameras = cameras
+                self.probed_at = time.time()
+                self._save()
+        finally:
+            with self.lock:
+                self.refreshing = False
+                listeners, self.listeners = self.listeners, []
+        for on_update in listeners:
+            on_update(cameras if cameras is not None else self.cameras or [])
 
 
 # ==============================
@@ -41,17 +180,196 @@ def get_camera_names():
 # ==============================
 # OPEN CAMERA SAFELY
 # ==============================
-def open_camera(index):
-    cap = cv2.VideoCapture(index, cv2.CAP_DSHOW if WINDOWS_SUPPORT else 0)
+class CameraHandle:
+    """
+    A camera being opened and warmed up on a worker thread. Returned at once by
+    open_camera_async; read()/get()/release() work like cv2.VideoCapture once
+    ready is set.
+
+    Cold cameras often deliver black frames or frames in bursts at first, so
+    the device counts as ready after stable_frames frames in a row that are
+    not black and arrive at a steady interval, not after a fixed frame count.
+    on_ready(handle) or on_error(handle, message) is called from the worker.
+    """
+
+    BLACK_LEVEL = 10 # Mean brightness below which a frame counts as black
+    JITTER = 0.5 # Allowed deviation from the median frame interval
+
+    def __init__(self, index, on_ready=None, on_error=None, timeout=10.0, stable_frames=5):
+        self.index = index
+        self.on_ready = on_ready
+        self.on_error = on_error
+        self.timeout = timeout
+        self.stable_frames = stable_frames
+        self.cap = None
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.cancelled = threading.Event()
+        self.error = None
+        self.frames_read = 0
+        self.startup_time = None
+
+    def start(self):
+        threading.Thread(target=self._warm_up, daemon=True).start()
+        return self
+
+    def wait(self, timeout=None):
+        """Blocks until the camera is ready; False if it failed or timed out."""
+        return self.ready.wait(timeout) and self.error is None
+
+    def _warm_up(self):
+        import cv2
+        start = time.monotonic()
+        cap = cv2.VideoCapture(self.index, cv2.CAP_DSHOW if WINDOWS_SUPPORT else 0)
+        if not cap.isOpened():
+            cap.release()
+            return self._fail(f"Camera {self.index} could not be opened")
+
+        stable, arrivals = 0, []
+        while not self.cancelled.is_set():
+            if time.monotonic() - start > self.timeout:
+                cap.release()
+                return self._fail(f"Camera {self.index} gave no stable frames within {self.timeout:.0f} s")
+
+            success, frame = cap.read()
+            now = time.monotonic()
+            self.frames_read += 1
+            if not success or frame is None or max(cv2.mean(frame[::8, ::8])[:3]) < self.BLACK_LEVEL:
+                stable, arrivals = 0, []
+                continue
+
+            arrivals.append(now)
+            stable = stable + 1 if self._steady(arrivals) else 1
+            if stable >= self.stable_frames:
+                break
+
+        with self.lock:
+            if self.cancelled.is_set():
+                cap.release()
+                return
+            self.cap = cap
+            self.startup_time = time.monotonic() - start
+        print(f"Camera {self.index} ready after {self.startup_time * 1000:.0f} ms ({self.frames_read} frames)")
+        self.ready.set()
+        if self.on_ready is not None:
+            self.on_ready(self)
+
+    def _steady(self, arrivals):
+        # Latest interval close to the median of the recent ones
+        recent = arrivals[-self.stable_frames - 1:]
+        intervals = [b - a for a, b in zip(recent, recent[1:])]
+        if not intervals:
+            return True
+        median = sorted(intervals)[len(intervals) // 2]
+        return median > 0 and abs(intervals[-1] - median) <= self.JITTER * median
+
+    def _fail(self, message):
+        self.error = message
+        print(message)
+        self.ready.set()
+        if self.on_error is not None and not self.cancelled.is_set():
+            self.on_error(self, message)
+
+    # VideoCapture interface
+    def read(self):
+        if self.cap is None:
+            return False, None
+        return self.cap.read()
+
+    def get(self, prop):
+        return self.cap.get(prop) if self.cap is not None else 0.0
 
-    if not cap.isOpened():
-        return None
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
 
-    # 🔥 Warm-up camera (important)
-    for _ in range(5):
-        cap.read()
+    def release(self):
+        with self.lock:
+            self.cancelled.set()
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
 
-    return cap
+
+class LatestFrameReader:
+    """
+    Drains a capture device on its own thread and keeps only the newest frame
+    and its capture time (time.perf_counter()), so a consumer slower than the
+    camera always gets a fresh frame instead of one that sat in the driver
+    buffer. Frames replaced before anyone read them are counted in dropped.
+
+    read() waits for a frame newer than the last one returned and sets
+    last_timestamp to its capture time; get()/release() work like
+    cv2.VideoCapture, and release() also releases the wrapped source.
+    """
+
+    def __init__(self, source, timeout=2.0):
+        self.source = source
+        self.timeout = timeout
+        self.cond = threading.Condition()
+        self.frame = None
+        self.timestamp = None
+        self.seq = 0
+        self.read_seq = 0
+        self.last_timestamp = None
+        self.frames = 0
+        self.dropped = 0
+        self.finished = False
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+        return self
+
+    def _drain(self):
+        try:
+            while not self.stopped.is_set():
+                success, frame = self.source.read()
+                captured = time.perf_counter()
+                if not success:
+                    break
+                with self.cond:
+                    if self.seq > self.read_seq:
+                        self.dropped += 1 # Previous frame was never read
+                    self.frame, self.timestamp = frame, captured
+                    self.seq += 1
+                    self.frames += 1
+                    self.cond.notify_all()
+        finally:
+            with self.cond:
+                self.finished = True
+                self.cond.notify_all()
+
+    def read(self):
+        with self.cond:
+            self.cond.wait_for(lambda: self.seq > self.read_seq or self.finished, self.timeout)
+            if self.seq == self.read_seq:
+                return False, None # Device stopped or stalled
+            self.read_seq = self.seq
+            self.last_timestamp = self.timestamp
+            return True, self.frame
+
+    def get(self, prop):
+        return self.source.get(prop)
+
+    def release(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(self.timeout)
+        self.source.release()
+        print(f"Camera reader: {self.frames} frames, {self.dropped} dropped")
+
+
+def open_camera_async(index, on_ready=None, on_error=None, timeout=10.0):
+    """Starts opening camera index in the background and returns its CameraHandle right away."""
+    return CameraHandle(index, on_ready, on_error, timeout).start()
+
+
+def open_camera(index):
+    # Blocking version, for the CLI
+    handle = open_camera_async(index)
+    return handle if handle.wait() else None
 
 
 # ==============================
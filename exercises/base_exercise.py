@@ -1,7 +1,22 @@
 # exercises/base_exercise.py
 import time
+import numpy as np
 
 class BaseExercise:
+    # Extra joints tracked alongside the main angle (names from PoseModule.JOINTS)
+    JOINTS = ()
+
+    # Cutoffs that fail a rep; a VELOCITY_LIMIT of None skips the smoothness check
+    PARTIAL_ROM = 0
+    ROM_LIMIT = 0
+    MIN_ANGLE_LIMIT = 180
+    MAX_ANGLE_LIMIT = 0
+    TEMPO_LIMIT = 0
+    VELOCITY_LIMIT = None
+
+    # Left and right joints are only compared when all their landmarks stayed
+    # at least this visible through the rep (MediaPipe visibility, 0-1)
+    VISIBILITY_THRESHOLD = 0.5
 
     def __init__(self):
         self.reset()
@@ -10,17 +25,28 @@ class BaseExercise:
         self.min_angle = 180.0
         self.max_angle = 0.0
         self.rep_start_time = None
+        self.last_time = None
         self.prev_angle = None
         self.angle_velocity_sum = 0.0
         self.frame_count = 0
+        self.joint_min = None
+        self.joint_max = None
+        self.joint_visibility = None
+
+    def update(self, angle, joint_angles=None, timestamp=None, joint_visibility=None):
+        # timestamp: media time of the frame in seconds (CAP_PROP_POS_MSEC or
+        # capture time). Tempo checks then hold however fast frames are processed;
+        # the monotonic clock is only a fallback for callers without one
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self.last_time = timestamp
 
-    def update(self, angle):
         self.min_angle = min(self.min_angle, float(angle))
         self.max_angle = max(self.max_angle, float(angle))
 
         if self.prev_angle is not None:
             if self.rep_start_time is None:
-                self.rep_start_time = time.time()
+                self.rep_start_time = timestamp
 
             velocity = abs(angle - self.prev_angle)
             self.angle_velocity_sum += velocity
@@ -28,10 +54,39 @@ class BaseExercise:
         self.prev_angle = angle
         self.frame_count += 1
 
+        # Angles for self.JOINTS, in the same order
+        if joint_angles is not None:
+            if self.joint_min is None:
+                self.joint_min = np.array(joint_angles, dtype=np.float64)
+                self.joint_max = self.joint_min.copy()
+            else:
+                np.minimum(self.joint_min, joint_angles, out=self.joint_min)
+                np.maximum(self.joint_max, joint_angles, out=self.joint_max)
+
+        # Lowest landmark visibility per joint over the rep
+        if joint_visibility is not None:
+            if self.joint_visibility is None:
+                self.joint_visibility = np.array(joint_visibility, dtype=np.float64)
+            else:
+                np.minimum(self.joint_visibility, joint_visibility, out=self.joint_visibility)
+
+    def joint_rom(self):
+        """Range of motion per tracked joint for the current rep, {} without joint data."""
+        if self.joint_min is None:
+            return {}
+        rom = self.joint_max - self.joint_min
+        return {name: round(float(r), 1) for name, r in zip(self.JOINTS, rom)}
+
+    def joints_visible(self, *joints):
+        """True when every named joint stayed above VISIBILITY_THRESHOLD for the whole rep."""
+        if self.joint_visibility is None:
+            return False
+        return all(self.joint_visibility[self.JOINTS.index(j)] >= self.VISIBILITY_THRESHOLD for j in joints)
+
     def calculate_tempo(self):
-        if self.rep_start_time:
-            return round(time.time() - self.rep_start_time, 2)
+        if self.rep_start_time is not None:
+            return round(self.last_time - self.rep_start_time, 2)
         return 0
 
     def get_live_feedback(self, angle):
-        return "Analyzing Form..."
\ No newline at end of file
+        return "Analyzing Form..."
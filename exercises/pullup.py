@@ -3,6 +3,16 @@ import time
 from .base_exercise import BaseExercise
 
 class PullupAnalyser(BaseExercise):
+    JOINTS = ("left_elbow", "right_elbow", "left_shoulder", "right_shoulder")
+
+    # Hand-picked fail cutoffs for pull-ups; re-tune with tune_thresholds.py --exercise pullup
+    PARTIAL_ROM = 85
+    ROM_LIMIT = 110
+    MIN_ANGLE_LIMIT = 65
+    MAX_ANGLE_LIMIT = 140
+    TEMPO_LIMIT = 0.7
+    VELOCITY_LIMIT = 10
+
     def __init__(self):
         super().__init__()
 
@@ -19,10 +29,10 @@ class PullupAnalyser(BaseExercise):
         rom = self.max_angle - self.min_angle
         
         # Specific Feedback for Pullups
-        if rom < 85:
+        if rom < self.PARTIAL_ROM:
             feedback.append("Drastic partial range! Focus on full movement.")
             formCorrect = False
-        elif rom < 110:
+        elif rom < self.ROM_LIMIT:
             feedback.append("Incomplete range - work on depth/height")
             formCorrect = False
 
@@ -30,7 +40,7 @@ class PullupAnalyser(BaseExercise):
         # TOP CHECK (Chin above bar)
         # =========================
         # Min angle 55 is good, but let's be more descriptive
-        if self.min_angle > 65:
+        if self.min_angle > self.MIN_ANGLE_LIMIT:
             feedback.append("PULL HIGHER: Chin not reaching the bar")
             formCorrect = False
         elif self.min_angle > 50:
@@ -41,7 +51,7 @@ class PullupAnalyser(BaseExercise):
         # =========================
         # BOTTOM CHECK (Dead hang / Lockout)
         # =========================
-        if self.max_angle < 140:
+        if self.max_angle < self.MAX_ANGLE_LIMIT:
             feedback.append("EXTEND FULLY: Arm lockout missing at bottom")
             formCorrect = False
         elif self.max_angle < 155:
@@ -53,7 +63,7 @@ class PullupAnalyser(BaseExercise):
         # TEMPO CHECK
         # =========================
         rep_time = self.calculate_tempo()
-        if rep_time < 0.7:
+        if rep_time < self.TEMPO_LIMIT:
             feedback.append("Too explosive/fast - control the drop")
             formCorrect = False
         elif rep_time > 4.5:
@@ -61,12 +71,19 @@ class PullupAnalyser(BaseExercise):
         else:
             feedback.append("Stable tempo")
 
+        # =========================
+        # SYMMETRY CHECK (Left vs Right)
+        # =========================
+        joint_rom = self.joint_rom()
+        if joint_rom and self.joints_visible("left_elbow", "right_elbow") and abs(joint_rom["left_elbow"] - joint_rom["right_elbow"]) > 30:
+            feedback.append("Uneven pull - one arm is doing more of the work")
+
         # =========================
         # SMOOTHNESS CHECK
         # =========================
-        if self.frame_count > 0:
+        if self.VELOCITY_LIMIT is not None and self.frame_count > 0:
             avg_velocity = self.angle_velocity_sum / self.frame_count
-            if avg_velocity > 10:
+            if avg_velocity > self.VELOCITY_LIMIT:
                 feedback.append("WARNING: Excessive swinging/kicking detected")
                 formCorrect = False
 
@@ -77,7 +94,8 @@ class PullupAnalyser(BaseExercise):
             "formCorrect": formCorrect,
             "feedback": feedback,
             "rom": round(rom, 1),
-            "repTime": round(rep_time, 2)
+            "repTime": round(rep_time, 2),
+            "jointRom": joint_rom
         }
         
         self.reset()
@@ -3,6 +3,15 @@ import time
 from .base_exercise import BaseExercise
 
 class PushupAnalyser(BaseExercise):
+    JOINTS = ("left_elbow", "right_elbow", "left_hip", "right_hip")
+
+    # Hand-picked fail cutoffs for push-ups; re-tune with tune_thresholds.py --exercise pushup
+    PARTIAL_ROM = 60
+    ROM_LIMIT = 80
+    MIN_ANGLE_LIMIT = 95
+    MAX_ANGLE_LIMIT = 150
+    TEMPO_LIMIT = 0.9
+
     def __init__(self):
         super().__init__()
 
@@ -17,17 +26,17 @@ class PushupAnalyser(BaseExercise):
         # RANGE OF MOTION (ROM)
         # =========================
         rom = self.max_angle - self.min_angle
-        if rom < 60:
+        if rom < self.PARTIAL_ROM:
             feedback.append("Drastic partial range! Move deeper between top and bottom.")
             formCorrect = False
-        elif rom < 80:
+        elif rom < self.ROM_LIMIT:
             feedback.append("Increase range of motion for better chest engagement")
             formCorrect = False
 
         # =========================
         # TOP CHECK (Lockout)
         # =========================
-        if self.max_angle < 150:
+        if self.max_angle < self.MAX_ANGLE_LIMIT:
             feedback.append("LOCKOUT ERROR: Fully straighten arms at the top")
             formCorrect = False
         elif self.max_angle < 165:
@@ -38,7 +47,7 @@ class PushupAnalyser(BaseExercise):
         # =========================
         # BOTTOM CHECK (Depth)
         # =========================
-        if self.min_angle > 95:
+        if self.min_angle > self.MIN_ANGLE_LIMIT:
             feedback.append("DEPTH ERROR: Go lower, chest closer to floor")
             formCorrect = False
         elif self.min_angle > 80:
@@ -50,7 +59,7 @@ class PushupAnalyser(BaseExercise):
         # TEMPO CHECK
         # =========================
         rep_time = self.calculate_tempo()
-        if rep_time < 0.9:
+        if rep_time < self.TEMPO_LIMIT:
             feedback.append("Too fast - control the descent and push")
             formCorrect = False
         elif rep_time > 3.5:
@@ -58,6 +67,27 @@ class PushupAnalyser(BaseExercise):
         else:
             feedback.append("Solid tempo")
 
+        # =========================
+        # SYMMETRY & BODY LINE CHECK
+        # =========================
+        joint_rom = self.joint_rom()
+        if joint_rom:
+            if self.joints_visible("left_elbow", "right_elbow") and abs(joint_rom["left_elbow"] - joint_rom["right_elbow"]) > 30:
+                feedback.append("Uneven push - keep both arms working equally")
+            # Only hips in view: a side camera sees one, the far one is guesswork
+            hips = [joint_rom[hip] for hip in ("left_hip", "right_hip") if self.joints_visible(hip)]
+            if hips and max(hips) > 35:
+                feedback.append("Keep your body in a straight line - hips are moving")
+
+        # =========================
+        # SMOOTHNESS CHECK
+        # =========================
+        if self.VELOCITY_LIMIT is not None and self.frame_count > 0:
+            avg_velocity = self.angle_velocity_sum / self.frame_count
+            if avg_velocity > self.VELOCITY_LIMIT:
+                feedback.append("WARNING: Jerky reps detected - keep the movement controlled")
+                formCorrect = False
+
         if formCorrect:
             feedback.append("PRO FORM: Perfect Push-up!")
 
@@ -66,7 +96,8 @@ class PushupAnalyser(BaseExercise):
             "formCorrect": formCorrect,
             "feedback": feedback,
             "rom": round(rom, 1),
-            "repTime": round(rep_time, 2)
+            "repTime": round(rep_time, 2),
+            "jointRom": joint_rom
         }
         
         self.reset()
@@ -3,6 +3,15 @@ import time
 from .base_exercise import BaseExercise
 
 class SquatAnalyser(BaseExercise):
+    JOINTS = ("left_knee", "right_knee", "left_hip", "right_hip")
+
+    # Hand-picked fail cutoffs for squats; re-tune with tune_thresholds.py --exercise squat
+    PARTIAL_ROM = 70
+    ROM_LIMIT = 95
+    MIN_ANGLE_LIMIT = 90
+    MAX_ANGLE_LIMIT = 155
+    TEMPO_LIMIT = 1.1
+
     def __init__(self):
         super().__init__()
 
@@ -17,17 +26,17 @@ class SquatAnalyser(BaseExercise):
         # RANGE OF MOTION (ROM)
         # =========================
         rom = self.max_angle - self.min_angle
-        if rom < 70:
+        if rom < self.PARTIAL_ROM:
             feedback.append("Drastic partial range! Squat deeper for effective results.")
             formCorrect = False
-        elif rom < 95:
+        elif rom < self.ROM_LIMIT:
             feedback.append("Incomplete range - focus on hip-to-knee depth")
             formCorrect = False
 
         # =========================
         # TOP CHECK (Lockout)
         # =========================
-        if self.max_angle < 155:
+        if self.max_angle < self.MAX_ANGLE_LIMIT:
             feedback.append("LOCKOUT ERROR: Stand up fully at the top")
             formCorrect = False
         elif self.max_angle < 170:
@@ -38,7 +47,7 @@ class SquatAnalyser(BaseExercise):
         # =========================
         # BOTTOM CHECK (Parallel)
         # =========================
-        if self.min_angle > 90:
+        if self.min_angle > self.MIN_ANGLE_LIMIT:
             feedback.append("DEPTH ERROR: Hips must reach at least knee level")
             formCorrect = False
         elif self.min_angle > 75:
@@ -50,7 +59,7 @@ class SquatAnalyser(BaseExercise):
         # TEMPO CHECK
         # =========================
         rep_time = self.calculate_tempo()
-        if rep_time < 1.1:
+        if rep_time < self.TEMPO_LIMIT:
             feedback.append("Too fast - control the descent to avoid injury")
             formCorrect = False
         elif rep_time > 4.2:
@@ -58,6 +67,22 @@ class SquatAnalyser(BaseExercise):
         else:
             feedback.append("Solid tempo")
 
+        # =========================
+        # SYMMETRY CHECK (Left vs Right)
+        # =========================
+        joint_rom = self.joint_rom()
+        if joint_rom and self.joints_visible("left_knee", "right_knee") and abs(joint_rom["left_knee"] - joint_rom["right_knee"]) > 30:
+            feedback.append("Uneven squat - shift your weight evenly")
+
+        # =========================
+        # SMOOTHNESS CHECK
+        # =========================
+        if self.VELOCITY_LIMIT is not None and self.frame_count > 0:
+            avg_velocity = self.angle_velocity_sum / self.frame_count
+            if avg_velocity > self.VELOCITY_LIMIT:
+                feedback.append("WARNING: Bouncing detected - control the descent")
+                formCorrect = False
+
         if formCorrect:
             feedback.append("PRO FORM: Perfect Squat!")
 
@@ -66,7 +91,8 @@ class SquatAnalyser(BaseExercise):
             "formCorrect": formCorrect,
             "feedback": feedback,
             "rom": round(rom, 1),
-            "repTime": round(rep_time, 2)
+            "repTime": round(rep_time, 2),
+            "jointRom": joint_rom
         }
         
         self.reset()
@@ -1,4 +1,8 @@
+import time
+
+STARTED = time.perf_counter()
+
 import sourceSelectorGUI as gui
 
 if __name__ == "__main__":
-    gui.launch_gui()
+    gui.launch_gui(started=STARTED)
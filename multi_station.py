@@ -0,0 +1,363 @@
+import argparse
+import cv2
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Add project root to path to import modules
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(PROJECT_ROOT)
+
+import cameraModule
+import PoseModule as pm
+import ProfilerModule
+import RepCounterModule as rep
+import ExerciseFactory
+import StreamModule
+import analyze_form
+
+# Short side frames are downscaled to before they are sent to a worker (None =
+# source size). Full 1080p frames are ~6 MB to pickle per job; 480 keeps the
+# bundled clips' rep counts, 256 picked up an extra partial rep on one of them
+INFERENCE_SIZE = 480
+# Frames a station may have queued or in inference at once
+IN_FLIGHT = 2
+
+
+# ==============================
+# INFERENCE WORKERS
+# ==============================
+def _inference_worker(inbox, results):
+    # One detector per station: MediaPipe tracks the pose from frame to frame,
+    # so a station's frames must always go to the same detector
+    cv2.setNumThreads(1) # The pool already saturates the cores
+    detectors = {}
+    while True:
+        job = inbox.get()
+        if job is None:
+            break
+        station_id, seq, frame = job
+        detector = detectors.get(station_id)
+        if detector is None:
+            detector = detectors[station_id] = pm.poseDetector()
+
+        start = time.perf_counter()
+        detector.findPose(frame, draw=False)
+        landmarks = detector.findLandmarks()
+        results.put((station_id, seq, None if landmarks is None else landmarks.copy(), time.perf_counter() - start))
+
+
+class InferencePool:
+    """
+    Pose inference on worker processes shared by all stations. Each station is
+    pinned to one worker (the least loaded when it joins) so its tracking state
+    stays in one place; results from every worker come back on one queue.
+    """
+
+    def __init__(self, workers):
+        ctx = multiprocessing.get_context("spawn")
+        self.inboxes = [ctx.Queue() for _ in range(workers)]
+        self.results = ctx.Queue()
+        self.load = [0] * workers
+        self.processes = [
+            ctx.Process(target=_inference_worker, args=(inbox, self.results), daemon=True)
+            for inbox in self.inboxes
+        ]
+
+    def start(self):
+        for process in self.processes:
+            process.start()
+
+    def assign(self):
+        worker = self.load.index(min(self.load))
+        self.load[worker] += 1
+        return worker
+
+    def submit(self, worker, station_id, seq, frame):
+        self.inboxes[worker].put((station_id, seq, frame))
+
+    def dead_workers(self):
+        return {i for i, process in enumerate(self.processes) if not process.is_alive()}
+
+    def get_result(self, timeout):
+        try:
+            return self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self, timeout=2.0):
+        for inbox in self.inboxes:
+            inbox.put(None)
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        # Jobs still queued for a dead worker would block the exit forever
+        for inbox in self.inboxes:
+            inbox.cancel_join_thread()
+
+
+# ==============================
+# STATIONS
+# ==============================
+def parse_source(spec):
+    """'0:pullup', 'clip.mp4:squat' or 'clip.mp4' -> (source, exercise); cameras are ints."""
+    source, exercise = spec, None
+    if ":" in spec:
+        head, tail = spec.rsplit(":", 1)
+        try:
+            exercise = ExerciseFactory.resolve_name(tail)
+            source = head
+        except ValueError:
+            pass # e.g. a Windows drive letter, not an exercise
+
+    if source.isdigit():
+        return int(source), exercise or "pullup"
+    return source, exercise or analyze_form.infer_exercise(source, default="pullup")
+
+
+class Station:
+    """
+    One athlete: a source with its own rep counter and analyser. A capture
+    thread decodes and downscales frames ahead of the scheduler. Video files
+    keep every frame; cameras keep only the newest and count the rest as
+    dropped, so a busy pool never makes a station fall behind real time.
+    """
+
+    def __init__(self, station_id, source, exercise, inference_size=INFERENCE_SIZE):
+        self.id = station_id
+        self.exercise = ExerciseFactory.resolve_name(exercise)
+        self.live = isinstance(source, int)
+        self.name = f"CAM-{source}" if self.live else os.path.basename(source)
+        self.source_spec = source
+        self.inference_size = inference_size
+        self.analyser, top, bottom = ExerciseFactory.get_exercise(self.exercise)
+        self.counter = rep.RepCounter(top_threshold=top, bottom_threshold=bottom)
+        self.triplets = pm.joint_triplets([ExerciseFactory.get_angle_points(self.exercise)] + list(self.analyser.JOINTS))
+        self.profiler = ProfilerModule.StageProfiler(stages=("inference", "latency"), enabled=True)
+        # Angles computed from the workers' landmarks go through the same rep stage as everywhere else
+        self.angle_feed = StreamModule.Feed()
+        self.updates = StreamModule.analyse(self.angle_feed, self.counter, self.analyser)
+
+        self.cap = None
+        self.frames = queue.Queue(maxsize=1 if self.live else IN_FLIGHT)
+        self.capture_done = threading.Event()
+        self.stopped = threading.Event()
+        self.in_flight = {}
+        self.worker = None
+        self.seq = 0
+        self.processed = 0
+        self.dropped = 0
+        self.rep_results = []
+        self.error = None
+
+    def open(self):
+        if self.live:
+            self.cap = cameraModule.open_camera(self.source_spec)
+        else:
+            self.cap = cv2.VideoCapture(self.source_spec)
+        if self.cap is None or not self.cap.isOpened():
+            raise IOError(f"Could not open {self.name}")
+        threading.Thread(target=self._capture, daemon=True).start()
+
+    def _capture(self):
+        try:
+            while not self.stopped.is_set():
+                success, frame = self.cap.read()
+                captured = time.perf_counter()
+                if not success:
+                    break
+                # Media time for files, capture time for cameras (ms)
+                timestamp = captured * 1000.0 if self.live else self.cap.get(cv2.CAP_PROP_POS_MSEC)
+                item = (self._downscale(frame), captured, timestamp)
+                if self.live:
+                    try:
+                        self.frames.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+                    self.frames.put_nowait(item)
+                else:
+                    while not self.stopped.is_set():
+                        try:
+                            self.frames.put(item, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+        finally:
+            self.capture_done.set()
+
+    def _downscale(self, frame):
+        # Angles don't change under uniform scaling, so landmarks need no mapping back
+        h, w = frame.shape[:2]
+        if self.inference_size and min(h, w) > self.inference_size:
+            scale = self.inference_size / min(h, w)
+            frame = cv2.resize(frame, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+        return frame
+
+    def next_frame(self):
+        """(seq, frame) to send for inference, or None if nothing is ready or too much is in flight."""
+        if self.error is not None or len(self.in_flight) >= IN_FLIGHT:
+            return None
+        try:
+            frame, captured, timestamp = self.frames.get_nowait()
+        except queue.Empty:
+            return None
+        self.seq += 1
+        self.in_flight[self.seq] = (captured, timestamp)
+        return self.seq, frame
+
+    def finished(self):
+        if self.error is not None:
+            return True
+        return self.capture_done.is_set() and self.frames.empty() and not self.in_flight
+
+    def fail(self, message):
+        # Frames in flight on a dead worker will never come back
+        self.error = message
+        self.in_flight.clear()
+        self.stopped.set()
+        print(f"[{self.name}] {message}")
+
+    def handle_result(self, seq, landmarks, inference_time):
+        if self.error is not None:
+            return
+        captured, timestamp = self.in_flight.pop(seq)
+        self.processed += 1
+        self.profiler.record("inference", inference_time)
+
+        angle = joint_angles = joint_visibility = None
+        if landmarks is not None:
+            angles = pm.compute_angles(landmarks, self.triplets)
+            angle = float(angles[0])
+            if self.analyser.JOINTS:
+                joint_angles = angles[1:]
+                joint_visibility = pm.compute_visibility(landmarks, self.triplets[1:])
+        self.angle_feed.push(StreamModule.AnglePacket(seq, timestamp, None, landmarks, angle, joint_angles, joint_visibility))
+        update = next(self.updates)
+        if update.rep_done:
+            self.rep_results.append(update.result)
+            print(f"[{self.name}] Rep {update.reps_count}: {' | '.join(update.result['feedback'])}")
+
+        # Glass to feedback: capture until the rep logic has seen the frame
+        self.profiler.record("latency", time.perf_counter() - captured)
+
+    def close(self):
+        self.stopped.set()
+        if self.cap is not None:
+            self.cap.release()
+
+    def report(self, elapsed):
+        summary = analyze_form.summarize_results(self.exercise, self.rep_results)
+        return {
+            "name": self.name,
+            "exercise": self.exercise,
+            "frames": self.processed,
+            "dropped_frames": self.dropped,
+            "fps": round(self.processed / elapsed, 2) if elapsed else 0.0,
+            "total_reps": summary["total_reps"],
+            "correct_reps": summary["correct_reps"],
+            "inference": self.profiler.stats("inference"),
+            "latency": self.profiler.stats("latency"),
+            "error": self.error,
+        }
+
+
+# ==============================
+# ENGINE
+# ==============================
+def run_stations(specs, workers=None, duration=None, inference_size=INFERENCE_SIZE, output="multi_station_report.json"):
+    """
+    Serves every station from one shared inference pool until all video files
+    end (cameras run until duration seconds or Ctrl+C). Frames are scheduled
+    round-robin, one per station per round, so a fast source can't starve the
+    others. Returns the throughput / latency report.
+    """
+    stations = [Station(i, *parse_source(spec), inference_size=inference_size) for i, spec in enumerate(specs)]
+    workers = workers or min(len(stations), os.cpu_count() or 1)
+    pool = InferencePool(workers)
+    pool.start()
+
+    for station in stations:
+        station.open()
+        station.worker = pool.assign()
+        print(f"{station.name}: {station.exercise} on worker {station.worker}")
+
+    print(f"Serving {len(stations)} stations with {workers} inference workers...")
+    start = time.perf_counter()
+    turn = 0
+    try:
+        while not all(station.finished() for station in stations):
+            if duration is not None and time.perf_counter() - start >= duration:
+                break
+
+            # Round-robin: each station gets at most one new frame per round,
+            # starting from a different station every time
+            for i in range(len(stations)):
+                station = stations[(turn + i) % len(stations)]
+                job = station.next_frame()
+                if job is not None:
+                    pool.submit(station.worker, station.id, *job)
+            turn += 1
+
+            result = pool.get_result(timeout=0.005)
+            while result is not None:
+                station_id, seq, landmarks, inference_time = result
+                stations[station_id].handle_result(seq, landmarks, inference_time)
+                result = pool.get_result(timeout=0)
+
+            for worker in pool.dead_workers():
+                for station in stations:
+                    if station.worker == worker and station.error is None:
+                        station.fail(f"inference worker {worker} died")
+    except KeyboardInterrupt:
+        print("Stopping...")
+    finally:
+        elapsed = time.perf_counter() - start
+        for station in stations:
+            station.close()
+        pool.close()
+
+    total_frames = sum(station.processed for station in stations)
+    report = {
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "workers": workers,
+        "inference_size": inference_size,
+        "duration_s": round(elapsed, 2),
+        "total_frames": total_frames,
+        "throughput_fps": round(total_frames / elapsed, 2) if elapsed else 0.0,
+        "stations": [station.report(elapsed) for station in stations],
+    }
+
+    print(f"\nThroughput: {report['throughput_fps']} frames/s over {report['duration_s']} s")
+    for entry in report["stations"]:
+        latency = entry["latency"]
+        print(f"{entry['name']}: {entry['frames']} frames ({entry['fps']} fps, {entry['dropped_frames']} dropped), "
+              f"{entry['total_reps']} reps, latency p50 {latency.get('p50_ms', 0)} ms / p95 {latency.get('p95_ms', 0)} ms")
+        if entry["error"]:
+            print(f"{entry['name']}: FAILED - {entry['error']}")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"Report saved to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve several stations (cameras or videos) from one inference pool.")
+    parser.add_argument("--source", action="append", required=True,
+                        help="Station as SOURCE[:EXERCISE], e.g. 0:pullup or clip.mp4:squat (repeat per station)")
+    parser.add_argument("--workers", type=int, default=None, help="Inference processes (default: one per station, up to CPU count)")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds (needed for cameras)")
+    parser.add_argument("--inference-size", type=int, default=INFERENCE_SIZE, help=f"Short side frames are downscaled to before inference, 0 = source size (default: {INFERENCE_SIZE})")
+    parser.add_argument("--output", default="multi_station_report.json", help="Report JSON path")
+    args = parser.parse_args()
+
+    run_stations(args.source, workers=args.workers, duration=args.duration,
+                 inference_size=args.inference_size, output=args.output)
@@ -1,20 +1,28 @@
 import os
-import json
-import time
-import cv2
+import queue
 import threading
-import numpy as np
+import time
 import customtkinter as ctk
-import google.generativeai as genai
 from dotenv import load_dotenv
 from datetime import datetime
-from PIL import Image, ImageTk
+from PIL import Image
 from tkinter import filedialog, messagebox
 from tkinterdnd2 import TkinterDnD, DND_FILES
 
+# OpenCV, MediaPipe (PoseModule, LandmarkCache, HudModule, DisplayModule) and
+# Gemini take seconds to import, so they are not imported here: warm_up_vision()
+# loads the vision side in the background and binds the modules below, which
+# every workout path can use once wait_for_vision() returned
 import cameraModule
-import PoseModule as pm
+import CoachModule
+import ExerciseFactory
+import PipelineModule
+import ProfilerModule
 import RepCounterModule as rep
+import SessionJournal
+import SessionStore
+
+cv2 = np = DisplayModule = HudModule = LandmarkCache = StreamModule = None
 
 # Futuristic Color Palette
 BG_COLOR = "#020617"
@@ -30,6 +38,16 @@ SUPPORTED_IMAGE_FORMATS = ["jpg", "jpeg", "png", "bmp", "webp"]
 ALL_FORMATS = SUPPORTED_VIDEO_FORMATS + SUPPORTED_IMAGE_FORMATS
 FORMAT_TEXT = " | ".join(ALL_FORMATS).upper()
 
+# Pose inference settings
+# adaptive: skip inference while the athlete holds still
+# roi: run inference on a crop around the last pose instead of the whole frame
+# inference_size: short side frames are downscaled to before inference (e.g. 256 or 480), None = source size
+DETECTOR_SETTINGS = {
+    "adaptive": False,
+    "roi": False,
+    "inference_size": None,
+}
+
 
 class MainApp(TkinterDnD.Tk):
 
@@ -47,26 +65,113 @@ class MainApp(TkinterDnD.Tk):
         self.is_running = False
         self.session_data = [] # New: Store all rep data
 
-        # CV Components
-        self.detector = pm.poseDetector()
+        # CV Components (detector, HUD and landmark cache are built by warm_up_vision)
+        self.detector = None
+        self.vision_ready = threading.Event()
+        self.vision_error = None
         self.reps = rep.RepCounter()
         self.analyser = None
         self.angle_points = (11, 13, 15)
         self.last_feedback = "Start your workout"
-        self.pTime = 0.0
+        self.fps_meter = ProfilerModule.FpsMeter()
+        self.hud = None
         self.update_job = None
 
-        # AI State
+        # Draw skeleton, angle and HUD on the display-size frame instead of the
+        # source frame (much less drawing for 1080p/4K sources)
+        self.render_at_display = True
+
+        # Pipeline mode: capture, inference and display run as separate stages
+        self.use_pipeline = True
+        self.pipeline = None
+        self.ui_queue = queue.Queue()
+
+        # Landmark cache for uploaded videos (skips inference on re-runs)
+        self.landmark_cache = None
+        self.cached_landmarks = None
+        self.landmark_recorder = None
+        self.frame_index = 0
+        self.source_fps = 30.0
+        self.source_finished = False
+
+        # Cameras are probed in the background and cached (.camera_cache.json)
+        self.camera_registry = cameraModule.CameraRegistry()
+        self.camera_registry.get()
+
+        # Session history (imports old sessions/*.json files on first run)
+        self.session_store = SessionStore.SessionStore()
+        self.session_store.import_json_dir("sessions")
+        # Reps of the running session are journaled as they happen; sessions
+        # cut short by a crash are recovered from the journal here
+        self.journal = None
+        SessionJournal.recover(self.session_store)
+
+        # AI State (Gemini is set up on first use, see load_model)
         load_dotenv()
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model = None
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-flash-latest')
+        self.model_lock = threading.Lock()
+        self.coach = CoachModule.AICoach(self.model, self.get_session_summary)
+        self.chat_cancel = None
+
+        # Stage profiling for slow machines: set TRAINER_PROFILE=1 (env or .env)
+        # to show per-stage timings on the HUD and write them to profiles/ on exit
+        self.profiler = ProfilerModule.StageProfiler(enabled=os.getenv("TRAINER_PROFILE") == "1")
         
         self.build_layout()
         self.show_exercise_selection()
 
+        # Load the pose model while the user picks an exercise
+        threading.Thread(target=self.warm_up_vision, daemon=True).start()
+
+    # ==========================================
+    # LAZY LOADING
+    # ==========================================
+    def warm_up_vision(self):
+        """Imports OpenCV/MediaPipe and runs one inference so the first workout frame isn't slow."""
+        global cv2, np, DisplayModule, HudModule, LandmarkCache, StreamModule
+        start = time.perf_counter()
+        try:
+            import cv2
+            import numpy as np
+            import DisplayModule
+            import HudModule
+            import LandmarkCache
+            import PoseModule as pm
+            import StreamModule
+
+            detector = pm.poseDetector(**DETECTOR_SETTINGS)
+            detector.findPose(np.zeros((256, 256, 3), dtype=np.uint8), draw=False)
+            detector.reset()
+            self.hud = HudModule.HudOverlay()
+            self.landmark_cache = LandmarkCache.LandmarkCache()
+            self.detector = detector
+            print(f"Pose detector ready after {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            self.vision_error = e
+            print(f"Error loading pose detector: {e}")
+        self.vision_ready.set()
+
+    def wait_for_vision(self):
+        """Blocks until warm_up_vision is done (only if a workout starts right away)."""
+        if not self.vision_ready.is_set():
+            self.configure(cursor="watch")
+            self.update_idletasks()
+            self.vision_ready.wait()
+            self.configure(cursor="")
+        if self.vision_error is not None:
+            messagebox.showerror("Pose detector", f"Could not load the pose detector:\n{self.vision_error}")
+            return False
+        return True
+
+    def load_model(self):
+        """Gemini model, configured on first use (call off the Tk thread)."""
+        with self.model_lock:
+            if self.model is None and self.api_key:
+                self.model = CoachModule.gemini_model(self.api_key)
+                self.coach.model = self.model
+            return self.model
+
     def build_layout(self):
         # MAIN CONTAINER
         self.main_container = ctk.CTkFrame(self, fg_color=BG_COLOR, corner_radius=0)
@@ -238,6 +343,10 @@ class MainApp(TkinterDnD.Tk):
     def show_chat_interface(self):
         self.clear_content()
         self.is_running = False # Stop workout if running
+
+        # Set Gemini up while the user types the first question
+        if self.api_key and self.model is None:
+            threading.Thread(target=self.load_model, daemon=True).start()
         
         # Update Sidebar Highlighting
         self.btn_trainer.configure(fg_color="transparent", text_color="#94a3b8", border_width=0)
@@ -294,39 +403,32 @@ class MainApp(TkinterDnD.Tk):
 
     def get_session_summary(self):
         """Aggregate session data for context injection."""
-        session_dir = "sessions"
-        if not os.path.exists(session_dir):
-            return "No previous session data found."
-        
-        files = [f for f in os.listdir(session_dir) if f.endswith(".json")]
-        if not files:
+        sessions = self.session_store.latest_sessions(3) # Take last 3 sessions
+        if not sessions:
             return "No previous sessions recorded."
-        
-        files.sort(reverse=True)
+
         summary = "User's Recent Workout History (Context for AI):\n"
-        
-        for f in files[:3]: # Take last 3 sessions
-            try:
-                with open(os.path.join(session_dir, f), 'r') as file:
-                    data = json.load(file)
-                    reps = data.get('reps', [])
-                    total_reps = len(reps)
-                    failed_reps = [r for r in reps if not r.get('success', True)]
-                    
-                    # Collect unique feedback from failed reps
-                    all_feedback = []
-                    for r in failed_reps:
-                        all_feedback.extend(r.get('feedback', []))
-                    unique_feedback = list(set(all_feedback))
-                    
-                    summary += f"- {data.get('date')}: {data.get('exercise')} ({total_reps} total)."
-                    if failed_reps:
-                        summary += f" ISSUES: {', '.join(unique_feedback)}. "
-                        summary += f"Success rate: {int((total_reps - len(failed_reps))/total_reps * 100)}%.\n"
-                    else:
-                        summary += " Perfect form achieved!\n"
-            except:
-                continue
+        for data in sessions:
+            reps = data["reps"]
+            total_reps = len(reps)
+            failed_reps = [r for r in reps if not r["success"]]
+
+            # Collect unique feedback from failed reps
+            all_feedback = []
+            for r in failed_reps:
+                all_feedback.extend(r["feedback"])
+            unique_feedback = list(set(all_feedback))
+
+            summary += f"- {data['date']}: {data['exercise']} ({total_reps} total)."
+            if failed_reps:
+                summary += f" ISSUES: {', '.join(unique_feedback)}. "
+                summary += f"Success rate: {int((total_reps - len(failed_reps))/total_reps * 100)}%.\n"
+            else:
+                summary += " Perfect form achieved!\n"
+
+        rates = self.session_store.success_rate()
+        summary += "All-time success rate: " + ", ".join(
+            f"{name} {int(r['rate'] * 100)}% of {r['total_reps']} reps" for name, r in rates.items()) + "\n"
         return summary
 
     def send_chat_message(self):
@@ -337,48 +439,46 @@ class MainApp(TkinterDnD.Tk):
         self.msg_entry.delete(0, 'end')
         self.add_chat_bubble("You", msg, is_user=True)
 
-        # Show typing indicator
-        self.typing_bubble = self.add_chat_bubble("AI Trainer", "...", is_user=False)
-        
+        # A new question supersedes the one still streaming
+        if self.chat_cancel is not None:
+            self.chat_cancel.set()
+        self.chat_cancel = threading.Event()
+
+        # Typing indicator, filled in as the answer streams in
+        bubble = self.add_chat_bubble("AI Trainer", "...", is_user=False)
+
         # Call AI in separate thread to avoid freezing GUI
-        import threading
-        threading.Thread(target=self.generate_ai_response, args=(msg,), daemon=True).start()
+        threading.Thread(target=self.generate_ai_response, args=(msg, bubble, self.chat_cancel), daemon=True).start()
 
-    def generate_ai_response(self, user_msg):
-        if not self.model:
+    def generate_ai_response(self, user_msg, bubble, cancel):
+        if not self.api_key:
             response = "I don't have an API key! Please add GEMINI_API_KEY to your .env file to enable smart chat."
         else:
             try:
-                context = self.get_session_summary()
-                system_prompt = f"""
-                You are a professional AI Personal Trainer Pro. 
-                Your goal is to provide technical, motivational, and safe advice about gym exercises.
-                
-                CURRENT USER DATA:
-                {context}
-                
-                Rules:
-                1. If asked about form, be detailed (Pushups, Pullups, Squats).
-                2. If the user mentions their history or "how did I do?", use the context provided above.
-                3. Be motivational but focus on safety. Use terms like "Range of Motion", "Tempo", and "Lockout".
-                4. If the user had "Pull higher" issues, explain that they aren't getting their chin above the bar.
-                5. If they had "Extend fully" issues, explain they aren't dropping low enough to the dead-hang position.
-                6. Keep responses futuristic, helpful, and concise (under 100 words).
-                """
-                
-                full_prompt = f"{system_prompt}\n\nUser Question: {user_msg}"
-                ai_res = self.model.generate_content(full_prompt)
-                response = ai_res.text
+                self.load_model()
+                response = self.coach.ask_stream(user_msg, lambda text: self.after(0, self.update_chat_bubble, bubble, text, cancel), cancel)
             except Exception as e:
                 response = f"Sorry, I encountered an error: {str(e)}"
 
-        # Remove typing indicator and add real response
-        self.after(0, lambda: self.finalize_chat(response))
+        if response is None:
+            response = "(interrupted)"
+        self.after(0, self.finalize_chat, bubble, response, cancel)
+
+    def update_chat_bubble(self, bubble, text, cancel):
+        if cancel.is_set() or not bubble.winfo_exists():
+            return
+        bubble.text_label.configure(text=text)
+        self.chat_history._parent_canvas.yview_moveto(1.0)
 
-    def finalize_chat(self, response):
-        if hasattr(self, 'typing_bubble'):
-            self.typing_bubble.destroy()
-        self.add_chat_bubble("AI Trainer", response, is_user=False)
+    def finalize_chat(self, bubble, response, cancel):
+        if not bubble.winfo_exists():
+            return
+        if cancel.is_set():
+            # Keep whatever had arrived before a newer question took over
+            current = bubble.text_label.cget("text")
+            response = "(interrupted)" if current == "..." else f"{current} (interrupted)"
+        bubble.text_label.configure(text=response)
+        self.chat_history._parent_canvas.yview_moveto(1.0)
 
     def add_chat_bubble(self, sender, text, is_user=True):
         bubble_frame = ctk.CTkFrame(self.chat_history, fg_color="transparent")
@@ -406,14 +506,15 @@ class MainApp(TkinterDnD.Tk):
             text_color="#cbd5e1"
         ).pack(anchor="w", padx=15, pady=(8, 2))
 
-        ctk.CTkLabel(
+        bubble_frame.text_label = ctk.CTkLabel(
             inner_bubble,
             text=text,
             font=ctk.CTkFont(size=14),
             text_color=txt_color,
             wraplength=400,
             justify="left"
-        ).pack(anchor="w", padx=15, pady=(0, 10))
+        )
+        bubble_frame.text_label.pack(anchor="w", padx=15, pady=(0, 10))
 
         # Scroll to bottom
         self.chat_history._parent_canvas.yview_moveto(1.0)
@@ -459,25 +560,21 @@ class MainApp(TkinterDnD.Tk):
         cam_scroll = ctk.CTkScrollableFrame(left_side, fg_color="transparent")
         cam_scroll.pack(fill="both", expand=True, padx=15, pady=15)
 
-        indexes = cameraModule.list_cameras()
-        names = cameraModule.get_camera_names()
+        # Cached list right away, refreshed in the background when stale
+        on_update = lambda cameras: self.after(0, self.fill_camera_list, cam_scroll, cameras)
+        self.fill_camera_list(cam_scroll, self.camera_registry.get(on_update))
 
-        if not indexes:
-            ctk.CTkLabel(cam_scroll, text="No Cameras Found", text_color="#ef4444").pack(pady=20)
-        else:
-            for idx in indexes:
-                cam_name = cameraModule.get_camera_name(idx, names)
-                ctk.CTkButton(
-                    cam_scroll,
-                    text=f"CAM-{idx}: {cam_name}",
-                    command=lambda i=idx, n=cam_name: self.start_workout(cameraModule.open_camera(i), n),
-                    height=55,
-                    corner_radius=10,
-                    fg_color="#1e293b",
-                    hover_color=ACCENT_COLOR,
-                    text_color="white",
-                    font=ctk.CTkFont(size=13, weight="bold")
-                ).pack(fill="x", pady=8)
+        ctk.CTkButton(
+            left_side,
+            text="RESCAN",
+            command=lambda: self.rescan_cameras(cam_scroll, on_update),
+            height=35,
+            fg_color="transparent",
+            hover_color=CARD_BG,
+            border_width=1,
+            border_color="#334155",
+            font=ctk.CTkFont(size=12, weight="bold")
+        ).pack(pady=(0, 15), padx=30, fill="x")
 
         # RIGHT - FILE UPLOAD
         right_side = ctk.CTkFrame(split_container, fg_color=SIDEBAR_COLOR, corner_radius=15, border_width=1, border_color="#334155")
@@ -504,6 +601,58 @@ class MainApp(TkinterDnD.Tk):
         self.drop_area.drop_target_register(DND_FILES)
         self.drop_area.dnd_bind("<<Drop>>", self.drop_file_and_start)
 
+    def fill_camera_list(self, cam_scroll, cameras):
+        if not cam_scroll.winfo_exists():
+            return # Left the source screen before the probe finished
+        for widget in cam_scroll.winfo_children():
+            widget.destroy()
+
+        if cameras is None:
+            ctk.CTkLabel(cam_scroll, text="Searching for cameras...", text_color="#64748b").pack(pady=20)
+        elif not cameras:
+            ctk.CTkLabel(cam_scroll, text="No Cameras Found", text_color="#ef4444").pack(pady=20)
+        else:
+            for camera in cameras:
+                idx, cam_name = camera["index"], camera["name"]
+                best = max(camera["resolutions"], key=lambda r: r[0] * r[1], default=None)
+                text = f"CAM-{idx}: {cam_name}" + (f"  ({best[0]}x{best[1]})" if best else "")
+                ctk.CTkButton(
+                    cam_scroll,
+                    text=text,
+                    command=lambda i=idx, n=cam_name: self.start_camera(i, n),
+                    height=55,
+                    corner_radius=10,
+                    fg_color="#1e293b",
+                    hover_color=ACCENT_COLOR,
+                    text_color="white",
+                    font=ctk.CTkFont(size=13, weight="bold")
+                ).pack(fill="x", pady=8)
+
+    def start_camera(self, index, name):
+        if not self.wait_for_vision():
+            return
+        # Warmed up on a worker thread; the session screen shows right away
+        handle = cameraModule.open_camera_async(
+            index,
+            on_ready=lambda h: self.after(0, self.camera_ready, h),
+            on_error=lambda h, message: self.after(0, self.camera_failed, h, message))
+        self.start_workout(handle, name)
+
+    def camera_ready(self, handle):
+        if handle is self.selected_source and self.is_running:
+            # Always process the newest frame, never one queued in the driver
+            self.selected_source = cameraModule.LatestFrameReader(handle).start()
+            self.update_frame()
+
+    def camera_failed(self, handle, message):
+        if handle is self.selected_source and self.is_running:
+            messagebox.showerror("Camera", message)
+            self.stop_workout_and_back()
+
+    def rescan_cameras(self, cam_scroll, on_update):
+        self.fill_camera_list(cam_scroll, None)
+        self.camera_registry.refresh(on_update)
+
     def choose_file_and_start(self):
         file_path = filedialog.askopenfilename(
             filetypes=[("Media Files", "*.mp4 *.avi *.mov *.mkv *.jpg *.jpeg *.png")]
@@ -516,6 +665,9 @@ class MainApp(TkinterDnD.Tk):
         self.process_selected_file(file_path)
 
     def process_selected_file(self, path):
+        if not self.wait_for_vision():
+            return
+
         ext = path.split(".")[-1].lower()
         if ext in ["jpg", "jpeg", "png", "bmp"]:
             img = cv2.imread(path)
@@ -524,39 +676,35 @@ class MainApp(TkinterDnD.Tk):
         else:
             cap = cv2.VideoCapture(path)
             if cap.isOpened():
-                self.start_workout(cap, os.path.basename(path))
+                self.start_workout(cap, os.path.basename(path), video_path=path)
 
     # ==========================================
     # STEP 3: WORKOUT SESSION
     # ==========================================
-    def start_workout(self, source, name):
+    def start_workout(self, source, name, video_path=None):
         self.selected_source = source
         self.selected_name = name
         self.session_data = [] # Reset for new session
+        self.journal = SessionJournal.SessionJournal(self.selected_exercise, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         self.reps = rep.RepCounter() # Reset rep counter for new session
+        self.detector.reset()
+        self.profiler.reset()
+        self.fps_meter.reset()
+        self.prepare_landmark_cache(video_path)
         self.clear_content()
 
         # Init Exercise Analyser
-        if self.selected_exercise == "pullups":
-            from exercises.pullup import PullupAnalyser
-            self.analyser = PullupAnalyser()
-            self.angle_points = (11, 13, 15) # Shoulder, Elbow, Wrist
-            self.reps.set_thresholds(100, 115) # Universal attempt detection for Pullups
-        elif self.selected_exercise == "pushups":
-            from exercises.pushup import PushupAnalyser
-            self.analyser = PushupAnalyser()
-            self.angle_points = (11, 13, 15) # Same as pullup essentially
-            self.reps.set_thresholds(110, 140) # Lenient: Capture partial pushups
-        elif self.selected_exercise == "squats":
-            from exercises.squat import SquatAnalyser
-            self.analyser = SquatAnalyser()
-            self.angle_points = (23, 25, 27) # Hip, Knee, Ankle
-            self.reps.set_thresholds(115, 145) # Lenient: Capture shallow squats
-        else:
+        try:
+            self.analyser, top, bottom = ExerciseFactory.get_exercise(self.selected_exercise)
+            self.angle_points = ExerciseFactory.get_angle_points(self.selected_exercise)
+            self.reps.set_thresholds(top, bottom)
+        except ValueError:
             self.analyser = None
             self.angle_points = (11, 13, 15) # Default
             self.reps.set_thresholds(60, 150) # Standard default
 
+        self.build_stream()
+
         # UI for Step 3
         header = ctk.CTkFrame(self.content_area, fg_color="transparent")
         header.pack(fill="x", pady=(0, 20))
@@ -591,6 +739,7 @@ class MainApp(TkinterDnD.Tk):
 
         self.video_label = ctk.CTkLabel(video_container, text="INITIALIZING SYSTEM...")
         self.video_label.pack(fill="both", expand=True, padx=2, pady=2)
+        self.frame_display = DisplayModule.FrameDisplay(self.video_label)
 
         # Stats Panel (HUD Style)
         stats_panel = ctk.CTkFrame(main_workout_frame, width=320, fg_color=SIDEBAR_COLOR, corner_radius=15, border_width=1, border_color="#334155")
@@ -621,83 +770,192 @@ class MainApp(TkinterDnD.Tk):
         self.history_scroll.pack(fill="both", expand=True, padx=15, pady=10)
 
         self.is_running = True
-        self.update_frame()
+        if isinstance(source, cameraModule.CameraHandle):
+            # camera_ready (always queued through after) starts the loop
+            self.video_label.configure(text="WARMING UP CAMERA...")
+        else:
+            self.update_frame()
+
+    def prepare_landmark_cache(self, video_path):
+        self.frame_index = 0
+        self.cached_landmarks = None
+        self.landmark_recorder = None
+        self.source_finished = False
+        if video_path is None:
+            return
+
+        try:
+            key = self.landmark_cache.key_for(video_path, self.detector)
+        except OSError as e:
+            print(f"Landmark cache unavailable: {e}")
+            return
+        cached = self.landmark_cache.load(key)
+        if cached is not None:
+            self.cached_landmarks = cached[0]
+            print(f"Landmark cache hit for {os.path.basename(video_path)}")
+        else:
+            self.landmark_recorder = LandmarkCache.LandmarkRecorder(self.landmark_cache, key)
+        self.source_fps = self.selected_source.get(cv2.CAP_PROP_FPS) or 30.0
 
     def stop_workout_and_back(self):
         self.is_running = False
         if self.update_job:
             self.after_cancel(self.update_job)
+        self.stop_pipeline()
+
+        # Cache landmarks only when the whole video went through inference
+        if self.landmark_recorder is not None and self.source_finished:
+            self.landmark_recorder.save()
+        self.landmark_recorder = None
         
         # Save session before exiting
         self.save_session()
-        
-        if self.selected_source is not None and isinstance(self.selected_source, cv2.VideoCapture):
+        self.save_profile()
+
+        # VideoCapture or CameraHandle (which also stops a camera still warming up)
+        if hasattr(self.selected_source, "release"):
             self.selected_source.release()
         
         self.show_exercise_selection()
 
+    def save_profile(self):
+        if not self.profiler.enabled:
+            return
+        try:
+            path = self.profiler.dump(label=self.selected_exercise, extra={
+                "source": self.selected_name,
+                "detector": self.detector.cacheSettings(),
+                "pipeline": self.use_pipeline,
+                "fps": round(self.fps_meter.fps(), 2),
+                "dropped_frames": getattr(self.selected_source, "dropped", None),
+            })
+            print(f"Stage profile saved to {path}")
+        except Exception as e:
+            print(f"Error saving profile: {e}")
+
+    def stop_pipeline(self):
+        if self.pipeline is not None:
+            # Returns only after the processing thread is done with reps/session_data
+            if not self.pipeline.stop():
+                print("Pipeline: capture thread still blocked in a read, leaving it behind")
+            if self.pipeline.latest_only:
+                print(f"Pipeline: {self.pipeline.dropped} stale frames skipped")
+            self.pipeline = None
+        # Drop widget updates meant for the finished session
+        while not self.ui_queue.empty():
+            self.ui_queue.get_nowait()
+
+    def post_ui(self, func, *args, **kwargs):
+        # Widgets may only be touched on the Tk thread
+        if threading.current_thread() is threading.main_thread():
+            func(*args, **kwargs)
+        else:
+            self.ui_queue.put((func, args, kwargs))
+
+    def flush_ui_updates(self):
+        while True:
+            try:
+                func, args, kwargs = self.ui_queue.get_nowait()
+            except queue.Empty:
+                return
+            func(*args, **kwargs)
+
     def update_frame(self):
         if not self.is_running:
+            self.stop_pipeline()
             return
 
         if self.selected_source is not None and isinstance(self.selected_source, np.ndarray):
             # Image mode
             frame = self.selected_source.copy()
             processed_frame = self.process_cv_logic(frame)
+            start = self.profiler.mark()
             self.display_frame(processed_frame)
+            self.profiler.lap("display", start)
             # No update loop for static images
+        elif self.use_pipeline and self.selected_source is not None:
+            # Pipeline mode: worker threads capture and process, Tk only displays
+            if self.pipeline is None:
+                live = isinstance(self.selected_source, cameraModule.LatestFrameReader)
+                self.pipeline = PipelineModule.FramePipeline(self.selected_source, self.process_cv_logic,
+                                                             profiler=self.profiler, latest_only=live,
+                                                             timestamp_fn=StreamModule.capture_timestamp)
+                self.pipeline.start()
+
+            self.flush_ui_updates()
+            frame = self.pipeline.get_latest()
+            if frame is not None:
+                start = self.profiler.mark()
+                self.display_frame(frame)
+                self.profiler.lap("display", start)
+            elif self.pipeline.finished.is_set():
+                self.source_finished = self.pipeline.error is None
+                self.stop_workout_and_back()
+                return
+            self.update_job = self.after(5, self.update_frame)
         else:
             # Video/Camera mode
+            start = self.profiler.mark()
             success, frame = self.selected_source.read() if self.selected_source is not None else (False, None)
             if success:
-                processed_frame = self.process_cv_logic(frame)
+                self.profiler.lap("capture", start)
+                captured = getattr(self.selected_source, "last_timestamp", None) or start
+                processed_frame = self.process_cv_logic(frame, StreamModule.capture_timestamp(self.selected_source))
+                if self.profiler.enabled:
+                    self.profiler.record("latency", time.perf_counter() - captured)
+                start = self.profiler.mark()
                 self.display_frame(processed_frame)
+                self.profiler.lap("display", start)
                 self.update_job = self.after(10, self.update_frame)
             else:
+                self.source_finished = True
                 self.stop_workout_and_back()
 
-    def process_cv_logic(self, img):
-        img_h, img_w = img.shape[:2]
-        
-        # Scaling factor and safety margins
-        scale = img_w / 1280
-        font_scale = max(0.6, 0.8 * scale)
-        thickness = max(1, int(2 * scale))
-        
-        # Use wider margins to prevent clipping in GUI
-        margin_x = int(img_w * 0.10)
-        margin_y = int(img_h * 0.15)
-        
-        # FPS Calculation
-        cTime = time.time()
-        fps = 1 / (cTime - self.pTime) if self.pTime != 0 else 0
-        self.pTime = cTime
-
-        # 1. FPS Overlay (Top Left)
-        cv2.putText(img, f"FPS: {int(fps)}", (margin_x, margin_y), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 255, 0), thickness)
-
-        img = self.detector.findPose(img)
-        lmList = self.detector.findPosition(img, False)
-
-        reps_count = self.reps.rep_count
+    def build_stream(self):
+        # process_cv_logic pushes each frame into the feed and pulls its rep
+        # update through the stages (landmarks -> angles -> reps). Counter and
+        # analyser live outside the stages, so a rebuild keeps the session's reps
+        self.frame_feed = StreamModule.Feed()
+        poses = StreamModule.landmarks(self.frame_feed, self.detector, self.cached_landmarks, self.profiler)
+        joints = self.analyser.JOINTS if self.analyser else ()
+        angles = StreamModule.angles(poses, self.detector, self.angle_points, joints)
+        self.rep_updates = StreamModule.analyse(angles, self.reps, self.analyser, self.profiler)
+
+    def process_cv_logic(self, img, timestamp=None):
+        """
+        One frame through pose, rep counting and overlays. timestamp: media
+        time of the frame in ms (capture time for cameras), so tempo verdicts
+        don't depend on how fast frames are processed; None for still images.
+        """
+        # FPS averaged over the recent frames
+        fps = self.fps_meter.tick()
+
+        self.frame_feed.push(StreamModule.FramePacket(self.frame_index, timestamp, img))
+        try:
+            update = next(self.rep_updates)
+        except Exception as e:
+            # An exception ends every generator in the chain: start fresh ones
+            # and skip this frame instead of failing on all the following ones
+            print(f"Error analysing frame {self.frame_index}: {e}")
+            self.build_stream()
+            self.landmark_recorder = None # Incomplete now, not worth caching
+            self.frame_index += 1
+            return img
+        if self.landmark_recorder is not None:
+            self.landmark_recorder.add(self.detector, timestamp if timestamp is not None else self.frame_index * 1000.0 / self.source_fps)
+        self.frame_index += 1
+
+        reps_count = update.reps_count
         percentage = 0
 
-        if len(lmList) != 0:
-            angle = self.detector.findAngle(img, self.angle_points[0], self.angle_points[1], self.angle_points[2], True)
-            
-            if self.analyser:
-                self.analyser.update(angle)
-
-            # 2. Progress Percentage Calculation
-            percentage = np.interp(angle, (50, 160), (100, 0))
-            percentage = np.clip(percentage, 0, 100)
+        if update.angle is not None:
+            # Progress Percentage Calculation
+            percentage = HudModule.progress_percentage(update.angle)
+            self.post_ui(self.rep_label.configure, text=f"Reps: {reps_count}")
 
-            reps_count, rep_done = self.reps.update(angle)
-            self.rep_label.configure(text=f"Reps: {reps_count}")
+            if update.result is not None:
+                result = update.result
 
-            if rep_done and self.analyser:
-                result = self.analyser.analyse_rep()
-                
                 rep_entry = {
                     "rep_num": reps_count,
                     "timestamp": datetime.now().strftime("%H:%M:%S"),
@@ -707,44 +965,29 @@ class MainApp(TkinterDnD.Tk):
                     "success": result.get("formCorrect", False)
                 }
                 self.session_data.append(rep_entry)
-                self.add_history_item(rep_entry)
+                self.journal.append(rep_entry)
+                self.post_ui(self.add_history_item, rep_entry)
 
                 self.last_feedback = " | ".join(result["feedback"])
                 print(f"--- REP {reps_count} FEEDBACK: {self.last_feedback} ---") # Added terminal print
-                self.feedback_label.configure(text=self.last_feedback.replace(" | ", "\n"))
-            elif not rep_done:
-                if hasattr(self.analyser, "get_live_feedback"):
-                    self.last_feedback = self.analyser.get_live_feedback(angle)
-                else:
-                    self.last_feedback = "Analyzing..."
-                self.feedback_label.configure(text=self.last_feedback)
-
-        # 3. Reps & Tempo Overlay
-        cv2.putText(img, f"Reps: {int(reps_count)}", (margin_x, margin_y + int(60 * scale)), cv2.FONT_HERSHEY_SIMPLEX, 1.2 * scale, (255, 0, 0), int(3 * scale))
-        
-        # Show last rep tempo if exists
-        last_tempo = self.session_data[-1]["tempo"] if self.session_data else 0
-        cv2.putText(img, f"Tempo: {last_tempo}s", (margin_x, margin_y + int(110 * scale)), cv2.FONT_HERSHEY_SIMPLEX, 0.8 * scale, (255, 255, 0), int(2 * scale))
+                self.post_ui(self.feedback_label.configure, text=self.last_feedback.replace(" | ", "\n"))
+            elif not update.rep_done:
+                self.last_feedback = update.live_feedback or "Analyzing..."
+                self.post_ui(self.feedback_label.configure, text=self.last_feedback)
 
-        # 4. Progress Bar Overlay
-        bar_x1, bar_y1 = margin_x, margin_y + int(160 * scale)
-        bar_height = int(300 * scale)
-        bar_width = int(40 * scale)
-        
-        cv2.rectangle(img, (bar_x1, bar_y1), (bar_x1 + bar_width, bar_y1 + bar_height), (0, 255, 0), thickness)
-        filled_h = int(np.interp(percentage, (0, 100), (0, bar_height)))
-        cv2.rectangle(img, (bar_x1, bar_y1 + bar_height - filled_h), (bar_x1 + bar_width, bar_y1 + bar_height), (0, 255, 0), cv2.FILLED)
-        cv2.putText(img, f"{int(percentage)}%", (bar_x1, bar_y1 - int(15 * scale)), cv2.FONT_HERSHEY_SIMPLEX, 0.8 * scale, (255, 255, 255), thickness)
-
-        # 5. Live Feedback Overlay (Bottom Left)
-        feedback_lines = self.last_feedback.split("|")
-        y_offset = img_h - int(120 * scale)
-        for i, line in enumerate(feedback_lines):
-            line = line.strip()
-            (text_w, text_h), _ = cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, thickness)
-            cv2.rectangle(img, (margin_x - 10, y_offset - text_h - 10 + i * int(45 * scale)), (margin_x + text_w + 10, y_offset + 10 + i * int(45 * scale)), (20, 20, 20), cv2.FILLED)
-            cv2.putText(img, line, (margin_x, y_offset + i * int(45 * scale)), cv2.FONT_HERSHEY_SIMPLEX, 0.7 * scale, (255, 255, 0), thickness)
+        t = self.profiler.mark()
+
+        # Overlays, back to front: skeleton, tracked angle, HUD
+        canvas, scale = DisplayModule.downscale(img) if self.render_at_display else (img, 1.0)
+        self.detector.drawSkeleton(canvas, scale)
+        if self.detector.findLandmarks() is not None:
+            self.detector.findAngle(canvas, self.angle_points[0], self.angle_points[1], self.angle_points[2], True, scale)
 
+        # Show last rep tempo if exists
+        last_tempo = self.session_data[-1]["tempo"] if self.session_data else 0
+        stats = self.profiler.hud_lines() if self.profiler.enabled else None
+        img = self.hud.draw(canvas, fps, reps_count, last_tempo, percentage, self.last_feedback, stats)
+        self.profiler.lap("overlay", t)
         return img
 
     def add_history_item(self, rep_data):
@@ -770,44 +1013,30 @@ class MainApp(TkinterDnD.Tk):
     def save_session(self):
         if not self.session_data:
             print("Session not saved: No reps completed.")
+            self.journal.discard()
             return
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"sessions/session_{self.selected_exercise}_{timestamp}.json"
-        
-        summary = {
-            "exercise": self.selected_exercise,
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "total_reps": len(self.session_data),
-            "reps": self.session_data
-        }
-
         try:
-            if not os.path.exists("sessions"):
-                os.makedirs("sessions")
-            with open(filename, 'w') as f:
-                json.dump(summary, f, indent=4)
-            print(f"Session saved to {filename}")
+            session_id = self.session_store.save_session(self.selected_exercise, self.session_data,
+                                                         self.journal.date, source=self.journal.name)
+            self.journal.discard()
+            self.coach.invalidate_context()
+            print(f"Session {session_id} saved to {self.session_store.path}")
         except Exception as e:
+            # The journal stays on disk and is recovered on the next start
+            self.journal.close()
             print(f"Error saving session: {e}")
 
     def display_frame(self, frame):
-        # Resize for GUI while maintaining aspect ratio
-        h, w = frame.shape[:2]
-        target_h = 600
-        aspect = w / h
-        target_w = int(target_h * aspect)
-        
-        frame_resized = cv2.resize(frame, (target_w, target_h))
-        frame_rgb = cv2.cvtColor(frame_resized, cv2.COLOR_BGR2RGB)
-        
-        img_pil = Image.fromarray(frame_rgb)
-        img_tk = ImageTk.PhotoImage(image=img_pil)
-        
-        self.video_label.configure(image=img_tk)
-        self.video_label.image = img_tk
+        # Resized to 600px high into reused buffers, shown by updating one PhotoImage in place
+        self.frame_display.show(frame)
 
-def launch_gui():
+def launch_gui(started=None):
+    """started: time.perf_counter() at process start, for the startup report."""
+    if started is None:
+        started = time.perf_counter()
     app = MainApp()
+    # Idle callbacks run once the pending redraws are done, i.e. after first paint
+    app.after_idle(lambda: print(f"Startup: first paint after {(time.perf_counter() - started) * 1000:.0f} ms"))
     app.mainloop()
 
@@ -0,0 +1,16 @@
+import cameraModule
+
+
+def steady_flags(arrivals, stable_frames=5):
+    handle = cameraModule.CameraHandle(0, stable_frames=stable_frames)
+    return [handle._steady(arrivals[:i + 1]) for i in range(len(arrivals))]
+
+
+def test_steady_frames_count_from_the_first_one():
+    arrivals = [i / 30.0 for i in range(12)]
+    assert steady_flags(arrivals) == [True] * 12
+
+
+def test_late_frame_is_not_steady():
+    arrivals = [i / 30.0 for i in range(4)] + [3 / 30.0 + 0.1]
+    assert steady_flags(arrivals) == [True, True, True, True, False]
@@ -0,0 +1,98 @@
+import os
+import threading
+
+import CoachModule
+
+
+def make_coach(tmp_path, model=None, summary="3 pull-up sessions"):
+    history = {"text": summary}
+    coach = CoachModule.AICoach(model or CoachModule.StubModel(), lambda: history["text"],
+                                cache_dir=str(tmp_path / "coach"))
+    return coach, history
+
+
+def test_ask_caches_normalized_questions(tmp_path):
+    coach, _ = make_coach(tmp_path)
+    first = coach.ask("How do I squat deeper??")
+    second = coach.ask("  how do i squat   deeper")
+    assert first == second == coach.model.reply
+    assert len(coach.model.prompts) == 1
+
+
+def test_ask_reads_answers_from_disk(tmp_path):
+    coach, _ = make_coach(tmp_path)
+    coach.ask("Is my tempo ok?")
+
+    fresh, _ = make_coach(tmp_path, CoachModule.StubModel(reply="unused"))
+    assert fresh.ask("Is my tempo ok?") == coach.model.reply
+    assert fresh.model.prompts == []
+
+
+def test_new_history_misses_the_cache(tmp_path):
+    coach, history = make_coach(tmp_path)
+    coach.ask("How did I do?")
+    history["text"] = "4 pull-up sessions"
+    coach.ask("How did I do?")
+    assert len(coach.model.prompts) == 1 # Context is still the cached summary
+
+    coach.invalidate_context()
+    coach.ask("How did I do?")
+    assert len(coach.model.prompts) == 2
+    assert "4 pull-up sessions" in coach.model.prompts[-1]
+
+
+def test_ask_stream_reports_growing_text(tmp_path):
+    coach, _ = make_coach(tmp_path, CoachModule.StubModel(reply="Keep your core tight."))
+    seen = []
+    assert coach.ask_stream("Core?", seen.append) == "Keep your core tight."
+    assert seen == ["Keep ", "Keep your ", "Keep your core ", "Keep your core tight."]
+
+    # Served from the cache in one piece
+    seen.clear()
+    assert coach.ask_stream("core", seen.append) == "Keep your core tight."
+    assert seen == ["Keep your core tight."]
+    assert len(coach.model.prompts) == 1
+
+
+def test_cancelled_stream_is_not_cached(tmp_path):
+    coach, _ = make_coach(tmp_path, CoachModule.StubModel(reply="one two three four"))
+    cancel = threading.Event()
+    seen = []
+
+    def on_text(text):
+        seen.append(text)
+        cancel.set()
+
+    assert coach.ask_stream("Count?", on_text, cancel) is None
+    assert seen == ["one "]
+
+    assert coach.ask("Count?") == "one two three four"
+    assert len(coach.model.prompts) == 2
+
+
+def test_empty_answers_are_not_cached(tmp_path):
+    coach, _ = make_coach(tmp_path, CoachModule.StubModel(reply=""))
+    assert coach.ask("Blocked?") == ""
+    assert coach.ask_stream("Blocked?", lambda text: None) == ""
+    assert coach.responses == {}
+    assert not (tmp_path / "coach").exists()
+
+    coach.model.reply = "Now it answers."
+    assert coach.ask("Blocked?") == "Now it answers."
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    coach, _ = make_coach(tmp_path)
+    folder = tmp_path / "coach"
+    for i, question in enumerate(("Grip?", "Core?", "Legs?")):
+        coach.ask(question)
+        path = folder / f"{coach.cache_key(question, coach.context()[1])}.json"
+        os.utime(path, (1000 + i, 1000 + i))
+    size = os.path.getsize(path)
+
+    fresh, _ = make_coach(tmp_path)
+    assert fresh.ask("Core?") == coach.model.reply # Read from disk: now the newest
+    fresh.max_disk_bytes = 2 * size
+    fresh.evict()
+    kept = {fresh.cache_key(q, fresh.context()[1]) + ".json" for q in ("Core?", "Legs?")}
+    assert set(os.listdir(folder)) == kept
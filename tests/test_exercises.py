@@ -0,0 +1,14 @@
+from exercises.pushup import PushupAnalyser
+
+
+def test_body_line_uses_only_visible_hips():
+    def feedback(visibility):
+        analyser = PushupAnalyser()
+        for i, angle in enumerate(list(range(160, 70, -5)) + list(range(70, 165, 5))):
+            # Near hip stays straight, the hidden far hip jitters wildly
+            analyser.update(angle, [angle, angle, 175.0, 120.0 + (i % 2) * 50], i / 20.0, visibility)
+        return analyser.analyse_rep()["feedback"]
+
+    body_line = "Keep your body in a straight line - hips are moving"
+    assert body_line not in feedback([0.9, 0.9, 0.9, 0.2])
+    assert body_line in feedback([0.9, 0.9, 0.9, 0.9])
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+
+from LandmarkCache import LandmarkCache
+
+
+class FakeDetector:
+    def __init__(self, **settings):
+        self.settings = dict({"model_complexity": 1, "roi": False}, **settings)
+
+    def cacheSettings(self):
+        return self.settings
+
+
+def write_video(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+
+def entry(frames):
+    return np.zeros((frames, 33, 4), dtype=np.float32), np.arange(frames) * 33.3
+
+
+def test_key_follows_content_and_settings(tmp_path):
+    cache = LandmarkCache(str(tmp_path / "cache"))
+    video = write_video(tmp_path / "a.mp4", b"frames")
+    copy = write_video(tmp_path / "b.mp4", b"frames")
+    other = write_video(tmp_path / "c.mp4", b"other frames")
+
+    key = cache.key_for(video, FakeDetector())
+    assert cache.key_for(copy, FakeDetector()) == key
+    assert cache.key_for(other, FakeDetector()) != key
+    assert cache.key_for(video, FakeDetector(roi=True)) != key
+
+
+def test_save_and_load(tmp_path):
+    cache = LandmarkCache(str(tmp_path / "cache"))
+    landmarks, timestamps = entry(5)
+    cache.save("k", landmarks, timestamps)
+
+    loaded_landmarks, loaded_timestamps = cache.load("k")
+    assert loaded_landmarks.shape == (5, 33, 4)
+    np.testing.assert_allclose(loaded_timestamps, timestamps)
+    assert cache.load("missing") is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    folder = tmp_path / "cache"
+    cache = LandmarkCache(str(folder), max_bytes=10 ** 9)
+    for i, key in enumerate(("old", "used", "new")):
+        cache.save(key, *entry(20))
+        os.utime(folder / f"{key}.npz", (1000 + i, 1000 + i))
+    size = os.path.getsize(folder / "new.npz")
+
+    assert cache.load("used") is not None # Touching it makes it the newest
+    cache.max_bytes = 2 * size
+    cache.evict()
+    assert sorted(os.listdir(folder)) == ["new.npz", "used.npz"]
+
+
+def test_large_files_are_sampled(tmp_path):
+    cache = LandmarkCache(str(tmp_path / "cache"))
+    cache.SAMPLES, cache.SAMPLE_BYTES = 4, 16
+    content = bytes(range(256)) * 4
+    video = write_video(tmp_path / "a.mp4", content)
+    key = cache.key_for(video, FakeDetector())
+
+    tail = write_video(tmp_path / "b.mp4", content[:-1] + b"x")
+    longer = write_video(tmp_path / "c.mp4", content + b"x")
+    assert cache.key_for(tail, FakeDetector()) != key
+    assert cache.key_for(longer, FakeDetector()) != key
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import PipelineModule
+
+
+class FakeSource:
+    """count numbered frames, then end of stream; each read takes delay seconds."""
+
+    def __init__(self, count, delay=0.0, block=None):
+        self.count = count
+        self.delay = delay
+        self.block = block
+        self.position = 0
+
+    def read(self):
+        if self.block is not None and self.position == self.count:
+            self.block.wait() # A device read that never returns
+        time.sleep(self.delay)
+        if self.position >= self.count:
+            return False, None
+        self.position += 1
+        return True, self.position
+
+
+def run(pipeline, timeout=5.0):
+    pipeline.start()
+    assert pipeline.finished.wait(timeout)
+
+
+def test_every_frame_is_processed_in_order_until_end_of_stream():
+    seen = []
+    pipeline = PipelineModule.FramePipeline(FakeSource(20), lambda frame, ts: seen.append((frame, ts)) or frame,
+                                            timestamp_fn=lambda source: source.position * 40.0)
+    run(pipeline)
+    assert seen == [(i, i * 40.0) for i in range(1, 21)]
+    assert pipeline.get_latest() == 20
+    assert pipeline.error is None
+    assert pipeline.stop() is True
+
+
+def test_processing_error_ends_the_pipeline():
+    def process(frame, timestamp):
+        if frame == 3:
+            raise ValueError("bad frame")
+        return frame
+
+    pipeline = PipelineModule.FramePipeline(FakeSource(10), process)
+    run(pipeline)
+    assert isinstance(pipeline.error, ValueError)
+    assert pipeline.stop() is True
+
+
+def test_stop_waits_for_the_frame_being_processed():
+    started, done = threading.Event(), []
+
+    def process(frame, timestamp):
+        started.set()
+        time.sleep(0.3)
+        done.append(frame)
+        return frame
+
+    pipeline = PipelineModule.FramePipeline(FakeSource(100), process)
+    pipeline.start()
+    assert started.wait(2.0)
+    assert pipeline.stop() is True
+    count = len(done)
+    assert count >= 1 # The frame in progress was finished before stop() returned
+    time.sleep(0.4)
+    assert len(done) == count # ...and nothing was processed afterwards
+
+
+def test_stop_reports_a_capture_thread_stuck_in_read():
+    block = threading.Event()
+    pipeline = PipelineModule.FramePipeline(FakeSource(2, block=block), lambda frame, ts: frame)
+    pipeline.start()
+    time.sleep(0.2)
+    assert pipeline.stop(timeout=0.2) is False
+    assert pipeline.finished.is_set()
+    block.set()
+
+
+def test_latest_only_skips_stale_frames():
+    seen = []
+
+    def process(frame, timestamp):
+        time.sleep(0.05)
+        seen.append(frame)
+        return frame
+
+    pipeline = PipelineModule.FramePipeline(FakeSource(40, delay=0.005), process, latest_only=True)
+    run(pipeline)
+    assert pipeline.dropped > 0
+    assert len(seen) + pipeline.dropped == 40
+    assert seen == sorted(seen) and seen[-1] == 40
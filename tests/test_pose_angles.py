@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import PoseModule as pm
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return pm.poseDetector()
+
+
+def random_poses(count, seed=0):
+    rng = np.random.default_rng(seed)
+    poses = rng.uniform(0, 1080, (count, pm.NUM_LANDMARKS, 4)).astype(np.float32)
+    poses[..., 3] = rng.uniform(0, 1, (count, pm.NUM_LANDMARKS))
+    return poses
+
+
+def test_compute_angles_matches_find_angle(detector):
+    triplets = list(pm.JOINTS.values()) + [(11, 13, 15), (24, 26, 28), (0, 5, 2)]
+    poses = random_poses(50)
+    batch = pm.compute_angles(poses, triplets)
+    assert batch.shape == (50, len(triplets))
+
+    for pose, expected in zip(poses, batch):
+        detector.setLandmarks(pose)
+        scalar = [detector.findAngle(None, *t) for t in triplets]
+        np.testing.assert_allclose(pm.compute_angles(pose, triplets), scalar, atol=1e-3)
+        np.testing.assert_allclose(expected, scalar, atol=1e-3)
+        np.testing.assert_allclose(detector.findAngles(list(pm.JOINTS)), scalar[:len(pm.JOINTS)], atol=1e-3)
+
+
+def test_visibility_is_the_lowest_of_the_three_points(detector):
+    pose = random_poses(1)[0]
+    detector.setLandmarks(pose)
+    joints = ("left_elbow", "right_knee")
+    expected = [min(pose[i, 3] for i in pm.JOINTS[j]) for j in joints]
+    np.testing.assert_allclose(detector.findVisibility(joints), expected)
+
+
+def test_no_pose_gives_no_angles(detector):
+    detector.setLandmarks(np.full((pm.NUM_LANDMARKS, 4), np.nan, dtype=np.float32))
+    assert detector.findAngles(["left_elbow"]) is None
+    assert detector.findVisibility(["left_elbow"]) is None
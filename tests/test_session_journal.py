@@ -0,0 +1,54 @@
+import os
+
+import SessionJournal
+import SessionStore
+
+
+def rep_entry(num, success=True):
+    return {"rep_num": num, "timestamp": "12:00:0%d" % num, "rom": 100.0 + num,
+            "tempo": 1.5, "success": success, "feedback": ["Stable tempo"]}
+
+
+def write_journal(folder, reps, torn_tail=False):
+    journal = SessionJournal.SessionJournal("pullup", "2026-01-02 12:00:00", folder=str(folder))
+    for entry in reps:
+        journal.append(entry)
+    journal.close()
+    if torn_tail:
+        with open(journal.path, 'a', encoding="utf-8") as f:
+            f.write('{"rep_num": 9, "rom"')
+    return journal
+
+
+def test_recover_moves_reps_into_the_store(tmp_path):
+    folder = tmp_path / "journal"
+    journal = write_journal(folder, [rep_entry(1), rep_entry(2, success=False)], torn_tail=True)
+    store = SessionStore.SessionStore(str(tmp_path / "sessions.db"))
+
+    assert SessionJournal.recover(store, str(folder)) == 1
+    assert not os.path.exists(journal.path)
+
+    session, = store.latest_sessions()
+    assert (session["exercise"], session["date"]) == ("pullup", "2026-01-02 12:00:00")
+    assert [r["rep_num"] for r in session["reps"]] == [1, 2]
+    assert session["correct_reps"] == 1
+    assert store.has_source(journal.name)
+
+
+def test_recover_skips_sessions_already_stored(tmp_path):
+    folder = tmp_path / "journal"
+    journal = write_journal(folder, [rep_entry(1)])
+    store = SessionStore.SessionStore(str(tmp_path / "sessions.db"))
+    store.save_session("pullup", [rep_entry(1)], journal.date, source=journal.name)
+
+    assert SessionJournal.recover(store, str(folder)) == 0
+    assert not os.path.exists(journal.path)
+    assert len(store.latest_sessions(limit=10)) == 1
+
+
+def test_discarded_journal_leaves_nothing_to_recover(tmp_path):
+    folder = tmp_path / "journal"
+    journal = write_journal(folder, [rep_entry(1)])
+    journal.discard()
+    store = SessionStore.SessionStore(str(tmp_path / "sessions.db"))
+    assert SessionJournal.recover(store, str(folder)) == 0
@@ -0,0 +1,70 @@
+import json
+
+import SessionStore
+
+
+def reps(results):
+    return [{"rep_num": i + 1, "timestamp": "10:00:00", "rom": 100.0, "tempo": 1.5,
+             "success": ok, "feedback": ["Stable tempo"]} for i, ok in enumerate(results)]
+
+
+def write_session_file(folder, name, exercise, date, results):
+    with open(folder / name, 'w') as f:
+        json.dump({"exercise": exercise, "date": date, "reps": reps(results)}, f)
+
+
+def test_import_json_dir_runs_once(tmp_path):
+    folder = tmp_path / "sessions"
+    folder.mkdir()
+    write_session_file(folder, "session_pullup_1.json", "pullup", "2026-01-01 10:00:00", [True, False])
+    write_session_file(folder, "session_squat_1.json", "squat", "2026-01-02 10:00:00", [True])
+    (folder / "session_broken.json").write_text("{not json")
+    store = SessionStore.SessionStore(str(tmp_path / "sessions.db"))
+
+    assert store.import_json_dir(str(folder)) == 2
+    assert store.has_source("session_pullup_1.json")
+    latest = store.latest_sessions(limit=10)
+    assert [s["exercise"] for s in latest] == ["squat", "pullup"] # Newest first
+    assert [r["success"] for r in latest[1]["reps"]] == [True, False]
+    assert latest[1]["reps"][0]["feedback"] == ["Stable tempo"]
+
+    # Files added later are not picked up: the import only runs once per database
+    write_session_file(folder, "session_pullup_2.json", "pullup", "2026-01-03 10:00:00", [True])
+    assert store.import_json_dir(str(folder)) == 0
+    assert len(store.latest_sessions(limit=10)) == 2
+
+
+def test_success_rate_matches_a_full_scan(tmp_path):
+    store = SessionStore.SessionStore(str(tmp_path / "sessions.db"))
+    history = [
+        ("pullup", "2026-01-01 10:00:00", [True, False, True]),
+        ("pullup", "2026-01-02 10:00:00", [False]),
+        ("squat", "2026-01-02 11:00:00", [True, True]),
+        ("pushup", "2026-01-03 10:00:00", []),
+    ]
+    for exercise, date, results in history:
+        store.save_session(exercise, reps(results), date)
+
+    def scan(exercise):
+        results = [ok for ex, _, rs in history if ex == exercise for ok in rs]
+        return len(results), sum(results)
+
+    rates = store.success_rate()
+    assert set(rates) == {"pullup", "squat", "pushup"}
+    for exercise, entry in rates.items():
+        total, correct = scan(exercise)
+        assert (entry["total_reps"], entry["correct_reps"]) == (total, correct)
+        assert entry["rate"] == (correct / total if total else 0.0)
+    assert rates["pullup"]["sessions"] == 2
+    assert store.success_rate("squat") == {"squat": rates["squat"]}
+
+
+def test_deleting_a_session_updates_the_totals(tmp_path):
+    store = SessionStore.SessionStore(str(tmp_path / "sessions.db"))
+    first = store.save_session("pullup", reps([True, True]), "2026-01-01 10:00:00")
+    store.save_session("pullup", reps([False]), "2026-01-02 10:00:00")
+    with store.conn:
+        store.conn.execute("DELETE FROM sessions WHERE id = ?", (first,))
+
+    assert store.success_rate()["pullup"] == {"sessions": 1, "total_reps": 1, "correct_reps": 0, "rate": 0.0}
+    assert store.conn.execute("SELECT COUNT(*) FROM reps WHERE session_id = ?", (first,)).fetchone()[0] == 0
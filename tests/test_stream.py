@@ -0,0 +1,78 @@
+import pytest
+
+import StreamModule
+import RepCounterModule as rep
+from exercises.pullup import PullupAnalyser
+
+
+def angle_packets(angles, fps=20.0, joint_visibility=None):
+    for i, angle in enumerate(angles):
+        # Right elbow barely moves: an uneven pull when both arms are in view
+        joints = [angle, 160.0, 40.0, 40.0] if joint_visibility is not None else None
+        yield StreamModule.AnglePacket(i, i * 1000.0 / fps, None, None, angle, joints, joint_visibility)
+
+
+def pullup_angles(reps):
+    # Dead hang -> chin over the bar -> dead hang, 2.2 s per rep at 20 fps
+    cycle = list(range(160, 50, -5)) + list(range(50, 160, 5))
+    return [160] + cycle * reps + [160]
+
+
+def test_feed_yields_pushed_items_in_order():
+    feed = StreamModule.Feed()
+    stream = iter(feed)
+    feed.push("a")
+    feed.push("b")
+    assert next(stream) == "a"
+    assert next(stream) == "b"
+    feed.push("c")
+    assert next(stream) == "c"
+
+
+def test_feed_pulled_empty_raises():
+    feed = StreamModule.Feed()
+    updates = StreamModule.analyse(feed, rep.RepCounter())
+    with pytest.raises(RuntimeError):
+        next(updates)
+
+
+def test_analyse_counts_and_scores_reps():
+    counter = rep.RepCounter(top_threshold=70, bottom_threshold=150)
+    updates = list(StreamModule.analyse(angle_packets(pullup_angles(3)), counter, PullupAnalyser()))
+
+    done = [u for u in updates if u.rep_done]
+    assert [u.reps_count for u in done] == [1, 2, 3]
+    assert all(u.result["formCorrect"] for u in done)
+    assert all(1.5 <= u.result["repTime"] <= 2.5 for u in done) # Media time, not wall clock
+    assert updates[1].live_feedback is not None
+
+
+def test_analyse_through_a_feed_matches_a_batch_run():
+    angles = pullup_angles(2)
+    batch = list(StreamModule.analyse(angle_packets(angles), rep.RepCounter(70, 150), PullupAnalyser()))
+
+    feed = StreamModule.Feed()
+    updates = StreamModule.analyse(feed, rep.RepCounter(70, 150), PullupAnalyser())
+    pushed = []
+    for packet in angle_packets(angles):
+        feed.push(packet)
+        pushed.append(next(updates))
+    assert pushed == batch
+
+
+def test_symmetry_needs_both_sides_visible():
+    def feedback(visibility):
+        updates = StreamModule.analyse(angle_packets(pullup_angles(1), joint_visibility=visibility),
+                                       rep.RepCounter(70, 150), PullupAnalyser())
+        done, = StreamModule.rep_events(updates)
+        return done.result["feedback"]
+
+    uneven = "Uneven pull - one arm is doing more of the work"
+    assert uneven in feedback([0.9, 0.9, 0.9, 0.9])
+    assert uneven not in feedback([0.9, 0.2, 0.9, 0.9]) # Far arm hidden behind the body
+
+
+def test_frames_without_a_pose_pass_through():
+    packets = [StreamModule.AnglePacket(0, 0.0, None, None, None, None)]
+    update, = StreamModule.analyse(iter(packets), rep.RepCounter())
+    assert (update.angle, update.reps_count, update.rep_done) == (None, 0, False)
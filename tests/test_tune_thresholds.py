@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+import ExerciseFactory
+import RepCounterModule as rep
+import StreamModule
+import tune_thresholds
+
+
+def synthetic_series(seed, reps=6, fps=30.0):
+    # Reps of varying depth, lockout and speed with some tracking noise
+    rng = np.random.default_rng(seed)
+    angles = [165.0]
+    for _ in range(reps):
+        low, high = rng.uniform(40, 110), rng.uniform(130, 175)
+        frames = int(rng.uniform(0.5, 3.0) * fps)
+        down = np.linspace(angles[-1], low, frames // 2)
+        up = np.linspace(low, high, frames - frames // 2)
+        angles.extend(np.concatenate([down, up]).tolist())
+    angles = np.array(angles) + rng.normal(0, 2.0, len(angles))
+    return angles, np.arange(len(angles)) / fps
+
+
+def sequential(angles, timestamps, exercise, top, bottom, rule):
+    # What the app does: RepCounter + the analyser's analyse_rep, frame by frame
+    analyser, _, _ = ExerciseFactory.get_exercise(exercise)
+    for name, value in rule.items():
+        setattr(analyser, name.upper(), None if np.isinf(value) else value)
+    packets = (StreamModule.AnglePacket(i, ts * 1000.0, None, None, angle, None)
+               for i, (angle, ts) in enumerate(zip(angles.tolist(), timestamps.tolist())))
+    results = [u.result for u in StreamModule.rep_events(
+        StreamModule.analyse(packets, rep.RepCounter(top, bottom), analyser))]
+    return len(results), sum(r["formCorrect"] for r in results)
+
+
+@pytest.mark.parametrize("exercise", ["pullup", "pushup", "squat"])
+def test_replay_matches_rep_counter_and_analyse_rep(exercise):
+    analyser, top, bottom = ExerciseFactory.get_exercise(exercise)
+    tops = np.array([top - 10.0, top, top + 10.0])
+    bottoms = np.array([bottom - 10.0, bottom, bottom])
+    velocity = np.inf if analyser.VELOCITY_LIMIT is None else analyser.VELOCITY_LIMIT
+    rules = tune_thresholds.build_rules(
+        analyser,
+        np.array([analyser.ROM_LIMIT - 20, analyser.ROM_LIMIT]),
+        np.array([analyser.MIN_ANGLE_LIMIT, analyser.MIN_ANGLE_LIMIT + 20]),
+        np.array([analyser.MAX_ANGLE_LIMIT]),
+        np.array([0.0, analyser.TEMPO_LIMIT]),
+        np.array([velocity, 2.0]),
+    )
+
+    for seed in range(3):
+        angles, timestamps = synthetic_series(seed)
+        counts, correct = tune_thresholds.replay(angles, timestamps, tops, bottoms, rules)
+        for g in range(len(tops)):
+            for r in range(len(rules["rom_limit"])):
+                rule = {name: rules[name][r] for name in tune_thresholds.RULE_NAMES}
+                # PARTIAL_ROM is folded into rom_limit by build_rules
+                rule["partial_rom"] = min(analyser.PARTIAL_ROM, rule["rom_limit"])
+                assert (counts[g], correct[g, r]) == sequential(angles, timestamps, exercise, tops[g], bottoms[g], rule)
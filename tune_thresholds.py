@@ -0,0 +1,232 @@
+import argparse
+import json
+import os
+import sys
+import numpy as np
+
+# Add project root to path to import modules
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(PROJECT_ROOT)
+
+import PoseModule as pm
+import ExerciseFactory
+import analyze_form
+from LandmarkCache import LandmarkCache
+
+RULE_NAMES = ("rom_limit", "min_angle_limit", "max_angle_limit", "tempo_limit", "velocity_limit")
+
+
+# ==============================
+# LOADING ANGLE SERIES
+# ==============================
+def load_labels(labels_path):
+    """
+    Labels file format:
+    {"series": [{"path": "exerciseVideos/Pullups/x.mp4", "reps": 4, "correct_reps": 0}, ...]}
+    path is a video (landmarks come from the LandmarkCache) or a CSV of timestamp_ms,angle.
+    correct_reps is optional; without it only the rep count is scored.
+    """
+    with open(labels_path, 'r') as f:
+        data = json.load(f)
+    base = os.path.dirname(os.path.abspath(labels_path))
+    for entry in data["series"]:
+        entry["path"] = os.path.join(base, entry["path"])
+    return data["series"]
+
+
+def load_series(path, exercise, cache, detector=None):
+    """(angles, timestamps in seconds) for the frames where a pose was found."""
+    if path.lower().endswith(".csv"):
+        data = np.genfromtxt(path, delimiter=",", ndmin=2)
+        data = data[~np.isnan(data).any(axis=1)] # Drops a header row
+        return data[:, 1], data[:, 0] / 1000.0
+
+    if detector is None:
+        detector = pm.poseDetector()
+    key = cache.key_for(path, detector)
+    entry = cache.load(key)
+    if entry is None:
+        # Runs inference once and fills the cache
+        for _ in analyze_form.video_landmarks(path, detector, cache):
+            pass
+        entry = cache.load(key)
+    landmarks, timestamps = entry
+
+    angles = pm.compute_angles(landmarks, [ExerciseFactory.get_angle_points(exercise)])[:, 0]
+    found = ~np.isnan(angles)
+    return angles[found].astype(np.float64), timestamps[found] / 1000.0
+
+
+# ==============================
+# VECTORIZED REPLAY
+# ==============================
+def replay(angles, timestamps, tops, bottoms, rules):
+    """
+    Replays one angle series through the RepCounter state machine for every
+    (top, bottom) pair (G,) and scores each completed rep against every analyser
+    rule set (R,) at once, mirroring BaseExercise.update / analyse_rep.
+    Returns rep counts (G,) and correct-form rep counts (G, R).
+    """
+    G = len(tops)
+    direction = np.zeros(G, dtype=bool)
+    counts = np.zeros(G, dtype=np.int64)
+    correct = np.zeros((G, len(rules["rom_limit"])), dtype=np.int64)
+
+    # Analyser state per counter configuration (reset whenever that config completes a rep)
+    mins = np.full(G, 180.0)
+    maxs = np.zeros(G)
+    start = np.full(G, np.nan)
+    velocity_sum = np.zeros(G)
+    frames = np.zeros(G, dtype=np.int64)
+
+    prev = None
+    for angle, ts in zip(angles.tolist(), timestamps.tolist()):
+        has_prev = frames > 0
+        if prev is not None:
+            velocity_sum[has_prev] += abs(angle - prev)
+        start[has_prev & np.isnan(start)] = ts
+        np.minimum(mins, angle, out=mins)
+        np.maximum(maxs, angle, out=maxs)
+        frames += 1
+
+        direction |= angle < tops
+        done = direction & (angle > bottoms)
+        if done.any():
+            counts[done] += 1
+            direction[done] = False
+
+            rep_min, rep_max = mins[done], maxs[done]
+            rep_start = start[done]
+            tempo = np.where(np.isnan(rep_start), 0.0, np.round(ts - rep_start, 2))
+            avg_velocity = velocity_sum[done] / frames[done]
+
+            ok = ((rep_max - rep_min)[:, None] >= rules["rom_limit"])
+            ok &= rep_min[:, None] <= rules["min_angle_limit"]
+            ok &= rep_max[:, None] >= rules["max_angle_limit"]
+            ok &= tempo[:, None] >= rules["tempo_limit"]
+            ok &= avg_velocity[:, None] <= rules["velocity_limit"]
+            correct[done] += ok
+
+            mins[done] = 180.0
+            maxs[done] = 0.0
+            start[done] = np.nan
+            velocity_sum[done] = 0.0
+            frames[done] = 0
+        prev = angle
+
+    return counts, correct
+
+
+def build_rules(analyser, rom, min_angle, max_angle, tempo, velocity):
+    # Every combination of the given cutoffs, flattened to (R,) arrays
+    grids = np.meshgrid(rom, min_angle, max_angle, tempo, velocity, indexing="ij")
+    rules = {name: g.ravel() for name, g in zip(RULE_NAMES, grids)}
+    # analyse_rep fails anything under PARTIAL_ROM regardless of ROM_LIMIT
+    rules["rom_limit"] = np.maximum(rules["rom_limit"], analyser.PARTIAL_ROM)
+    return rules
+
+
+def tune(series, tops, bottoms, rules, top_n=10, current=None):
+    top_grid, bottom_grid = (g.ravel() for g in np.meshgrid(tops, bottoms, indexing="ij"))
+    rep_error = np.zeros(len(top_grid))
+    form_error = np.zeros((len(top_grid), len(rules["rom_limit"])))
+
+    for s in series:
+        counts, correct = replay(s["angles"], s["timestamps"], top_grid, bottom_grid, rules)
+        rep_error += np.abs(counts - s["reps"])
+        if s.get("correct_reps") is not None:
+            form_error += np.abs(correct - s["correct_reps"])
+
+    score = rep_error[:, None] + form_error
+    # Ties go to the counter thresholds closest to the current ones
+    distance = np.zeros(len(top_grid))
+    if current is not None:
+        distance = np.abs(top_grid - current[0]) + np.abs(bottom_grid - current[1])
+    distance = np.broadcast_to(distance[:, None], score.shape)
+    order = np.lexsort((distance.ravel(), score.ravel()))[:top_n]
+    ranked = []
+    for flat in order:
+        g, r = np.unravel_index(flat, score.shape)
+        config = {"top": float(top_grid[g]), "bottom": float(bottom_grid[g])}
+        config.update({name: float(rules[name][r]) for name in RULE_NAMES})
+        config["rep_error"] = float(rep_error[g])
+        config["form_error"] = float(form_error[g, r])
+        ranked.append(config)
+    return ranked
+
+
+def parse_values(text):
+    """'a:b:step' (inclusive) or a comma separated list."""
+    if ":" in text:
+        start, stop, step = (float(x) for x in text.split(":"))
+        return np.arange(start, stop + step / 2, step)
+    return np.array([float(x) for x in text.split(",")])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grid-search RepCounter and analyser thresholds against labelled rep counts.")
+    parser.add_argument("labels", help="Labels JSON (see load_labels)")
+    parser.add_argument("--exercise", required=True, type=analyze_form.exercise_arg, help="pullup, pushup or squat")
+    parser.add_argument("--top", default="40:130:5", help="RepCounter top thresholds")
+    parser.add_argument("--bottom", default="100:170:5", help="RepCounter bottom thresholds")
+    parser.add_argument("--rom-limit", help="Analyser ROM_LIMIT values (default: current)")
+    parser.add_argument("--min-angle-limit", help="Analyser MIN_ANGLE_LIMIT values (default: current)")
+    parser.add_argument("--max-angle-limit", help="Analyser MAX_ANGLE_LIMIT values (default: current)")
+    parser.add_argument("--tempo-limit", help="Analyser TEMPO_LIMIT values (default: current)")
+    parser.add_argument("--velocity-limit", help="Analyser VELOCITY_LIMIT values (default: current)")
+    parser.add_argument("--cache-dir", default=".landmark_cache", help="Landmark cache folder")
+    parser.add_argument("--top-n", type=int, default=10, help="How many configurations to report")
+    parser.add_argument("--output", default="tuning_results.json", help="Ranked results JSON path")
+    args = parser.parse_args()
+
+    exercise = ExerciseFactory.resolve_name(args.exercise)
+    analyser, default_top, default_bottom = ExerciseFactory.get_exercise(exercise)
+
+    def values(arg, current):
+        if arg:
+            return parse_values(arg)
+        return np.array([np.inf if current is None else float(current)])
+
+    rules = build_rules(
+        analyser,
+        values(args.rom_limit, analyser.ROM_LIMIT),
+        values(args.min_angle_limit, analyser.MIN_ANGLE_LIMIT),
+        values(args.max_angle_limit, analyser.MAX_ANGLE_LIMIT),
+        values(args.tempo_limit, analyser.TEMPO_LIMIT),
+        values(args.velocity_limit, analyser.VELOCITY_LIMIT),
+    )
+
+    cache = LandmarkCache(args.cache_dir)
+    detector = None
+    series = []
+    for entry in load_labels(args.labels):
+        path = entry["path"]
+        is_video = not path.lower().endswith(".csv")
+        entry_exercise = entry.get("exercise") or (analyze_form.infer_exercise(path, exercise) if is_video else exercise)
+        if ExerciseFactory.resolve_name(entry_exercise) != exercise:
+            continue
+        if is_video and detector is None:
+            detector = pm.poseDetector()
+        angles, timestamps = load_series(path, exercise, cache, detector)
+        series.append({"path": path, "angles": angles, "timestamps": timestamps,
+                       "reps": entry["reps"], "correct_reps": entry.get("correct_reps")})
+
+    if not series:
+        print("No labelled series for this exercise.")
+        sys.exit(1)
+
+    tops, bottoms = parse_values(args.top), parse_values(args.bottom)
+    combos = len(tops) * len(bottoms) * len(rules["rom_limit"])
+    print(f"Replaying {len(series)} series over {combos} configurations...")
+
+    ranked = tune(series, tops, bottoms, rules, args.top_n, current=(default_top, default_bottom))
+    baseline = tune(series, np.array([default_top]), np.array([default_bottom]),
+                    build_rules(analyser, *[values(None, getattr(analyser, n.upper())) for n in RULE_NAMES]), 1)[0]
+
+    print(f"Current: top={default_top} bottom={default_bottom} rep_error={baseline['rep_error']} form_error={baseline['form_error']}")
+    for i, config in enumerate(ranked, 1):
+        print(f"{i:>2}. " + " ".join(f"{k}={v:g}" for k, v in config.items()))
+
+    with open(args.output, 'w') as f:
+        json.dump({"exercise": exercise, "current": baseline, "ranked": ranked}, f, indent=4)
+    print(f"Results saved to {args.output}")